@@ -0,0 +1,197 @@
+import gzip
+import hashlib
+import json
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from . import fragments
+from .models import Challenge
+from .pagination import CursorPaginator, InvalidCursor
+from .views import ChallengeList, filter_challenges
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 모바일용 읽기 전용 JSON API
+# ETag 는 fragments 의 버전 스탬프로 만들기 때문에, 바뀐 게 없으면 캐시만 보고 DB 조회 없이 304 를 돌려줌
+# 압축은 GZipMiddleware 대신 직접 함 (미들웨어는 strong ETag 를 weak 로 바꿔버림)
+
+FIELDS = (
+    'id', 'title', 'category', 'duration', 'description', 'starts_at', 'ends_at',
+    'participant_count', 'verified_count', 'url',
+)
+LIST_FIELDS = tuple(name for name in FIELDS if name != 'description')
+MAX_LIMIT = 100
+COMPRESS_MIN_LENGTH = 200
+# ?status= 목록은 시간이 지나면 결과가 바뀌므로 ETag 에 분 단위 구간을 섞음
+STATUS_BUCKET_SECONDS = 60
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _error(message, status):
+    return JsonResponse({'detail': message}, status=status)
+
+
+def parse_fields(request, default):
+    value = request.GET.get('fields')
+    if not value:
+        return default
+    fields = tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in FIELDS]
+    if unknown:
+        raise BadRequest(f'알 수 없는 필드입니다: {", ".join(unknown)}')
+    return fields
+
+
+def serialize(challenge, fields):
+    data = {}
+    for name in fields:
+        if name == 'id':
+            data[name] = challenge.pk
+        elif name == 'url':
+            data[name] = challenge.get_absolute_url()
+        else:
+            data[name] = getattr(challenge, name)
+    return data
+
+
+def _db_fields(fields):
+    return [name for name in fields if name not in ('id', 'url')]
+
+
+def choose_encoding(request):
+    accepted = {
+        part.split(';')[0].strip().lower()
+        for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(',')
+    }
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=5)
+    return gzip.compress(content, compresslevel=6, mtime=0)
+
+
+# 인코딩마다 바이트가 다르므로 strong ETag 도 인코딩별로 구분함
+def make_etag(parts, encoding):
+    digest = hashlib.sha1(':'.join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+
+# 작은 응답은 압축하지 않으므로 인코딩 없는 ETag 도 같은 버전으로 인정함
+def _matching_etag(request, candidates, last_modified):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        if '*' in etags:
+            return candidates[0]
+        return next((etag for etag in candidates if etag in etags), None)
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    if if_modified_since is not None and int(last_modified) <= if_modified_since:
+        return candidates[0]
+    return None
+
+
+def _with_validators(response, etag, last_modified, encoding):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'public, no-cache'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if encoding and response.status_code == 200:
+        response['Content-Encoding'] = encoding
+    return response
+
+
+# 검증 -> 캐시된 본문 -> 직렬화 순서로 처리
+# build() 는 캐시에 본문이 없을 때만 호출됨
+def conditional_json(request, parts, version, build):
+    encoding = choose_encoding(request)
+    etag = make_etag(parts, encoding)
+    last_modified = version / 1e9
+    matched = _matching_etag(request, [etag, make_etag(parts, None)], last_modified)
+    if matched is not None:
+        return _with_validators(HttpResponseNotModified(), matched, last_modified, encoding)
+
+    key = 'api:' + etag.strip('"')
+    content = fragments.fragment_cache().get(key)
+    if content is None:
+        data = build()
+        if data is None:
+            return _error('찾을 수 없습니다.', 404)
+        content = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
+        if encoding and len(content) >= COMPRESS_MIN_LENGTH:
+            content = compress(content, encoding)
+        else:
+            encoding = None
+            etag = make_etag(parts, None)
+        fragments.fragment_cache().set(key, (content, encoding, etag))
+    else:
+        content, encoding, etag = content
+
+    response = HttpResponse(content, content_type='application/json')
+    return _with_validators(response, etag, last_modified, encoding)
+
+
+@require_safe
+def challenge_list(request):
+    # 정렬과 필터는 ChallengeList 와 같음 (-pk, ?status, ?category)
+    try:
+        fields = parse_fields(request, LIST_FIELDS)
+        limit = min(max(int(request.GET.get('limit', ChallengeList.paginate_by)), 1), MAX_LIMIT)
+    except BadRequest as e:
+        return _error(str(e), 400)
+    except ValueError:
+        return _error('limit 은 숫자여야 합니다.', 400)
+
+    version = fragments.list_version()
+    parts = ['list', version, request.GET.urlencode()]
+    if request.GET.get('status'):
+        bucket = int(time.time() // STATUS_BUCKET_SECONDS)
+        parts.append(bucket)
+        version = max(version, bucket * STATUS_BUCKET_SECONDS * 10**9)
+
+    def build():
+        queryset = filter_challenges(Challenge.objects.only(*_db_fields(fields)), request.GET)
+        paginator = CursorPaginator(queryset, limit)
+        page = paginator.page(request.GET.get(ChallengeList.cursor_kwarg))
+        return {
+            'results': [serialize(challenge, fields) for challenge in page],
+            'next': page.next_cursor,
+            'previous': page.previous_cursor,
+        }
+
+    try:
+        return conditional_json(request, parts, version, build)
+    except InvalidCursor as e:
+        return _error(str(e), 400)
+
+
+@require_safe
+def challenge_detail(request, pk):
+    try:
+        fields = parse_fields(request, FIELDS)
+    except BadRequest as e:
+        return _error(str(e), 400)
+
+    version = fragments.challenge_version(pk)
+
+    def build():
+        challenge = Challenge.objects.only(*_db_fields(fields)).filter(pk=pk).first()
+        return serialize(challenge, fields) if challenge is not None else None
+
+    return conditional_json(request, ['challenge', pk, version, ','.join(fields)], version, build)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class HabitStackerConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "habit_stacker"
+
+    def ready(self):
+        from . import checks, signals, tasks  # noqa: F401
@@ -0,0 +1,165 @@
+import json
+import zlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .fragments import bump_challenge_version
+from .models import Challenge, ChallengeParticipant, ParticipationArchive
+from .routers import each_shard, participants_for, shard_for
+
+# 끝난 챌린지의 ChallengeParticipant 행을 보관 테이블로 옮겨서 자주 읽는 참여 테이블을 작게 유지함
+# 1. ends_at 이 HABIT_ARCHIVE_AFTER_DAYS 보다 오래된 챌린지를 ARCHIVE_PENDING 으로 표시 (카운터는 이때 값으로 고정)
+# 2. 샤드마다 PENDING 챌린지의 참여 행을 batch_size 개씩 읽어서 사용자별로 압축한 보관 행을 만들고 원래 행을 지움
+#    (보관 행과 참여 행이 같은 샤드에 있어서 한 트랜잭션으로 옮김)
+# 3. 남은 행이 없으면 ARCHIVE_DONE
+# 상태가 모두 DB에 있으므로 중간에 멈춰도 다시 실행하면 남은 행부터 이어서 처리함
+
+COLUMNS = ('challenge_id', 'join_data', 'is_verified', 'checkin_bits', 'verified_at')
+
+
+def _timestamp(value):
+    return None if value is None else int(value.timestamp())
+
+
+def _datetime(value):
+    return None if value is None else datetime.fromtimestamp(value, tz=dt_timezone.utc)
+
+
+def pack(participants):
+    columns = {
+        'challenge_id': [p.challenge_id for p in participants],
+        'join_data': [_timestamp(p.join_data) for p in participants],
+        'is_verified': [int(p.is_verified) for p in participants],
+        'checkin_bits': [p.checkin_bits for p in participants],
+        'verified_at': [_timestamp(p.verified_at) for p in participants],
+    }
+    return zlib.compress(json.dumps(columns, separators=(',', ':')).encode(), 9)
+
+
+# 보관된 참여 기록, 읽기 전용으로 ChallengeParticipant 와 같은 이름의 속성을 가짐
+class ArchivedParticipant:
+    archived = True
+
+    def __init__(self, user_id, challenge_id, join_data, is_verified, checkin_bits, verified_at):
+        self.user_id = user_id
+        self.challenge_id = challenge_id
+        self.join_data = _datetime(join_data)
+        self.is_verified = bool(is_verified)
+        self.checkin_bits = checkin_bits
+        self.verified_at = _datetime(verified_at)
+
+    def __repr__(self):
+        return f'<ArchivedParticipant user={self.user_id} challenge={self.challenge_id}>'
+
+
+def unpack(archive):
+    columns = json.loads(zlib.decompress(bytes(archive.columns)))
+    return [
+        ArchivedParticipant(archive.user_id, *values)
+        for values in zip(*(columns[name] for name in COLUMNS))
+    ]
+
+
+def archived_participations(user_id):
+    archives = ParticipationArchive.objects.using(shard_for(user_id)).filter(user_id=user_id).order_by('pk')
+    return [participant for archive in archives for participant in unpack(archive)]
+
+
+# 지난 기록까지 보여주는 화면용: 참여 테이블과 보관 테이블을 합쳐서 최근 참여 순으로 돌려줌
+# with_challenge=True 면 .challenge 도 한 번의 쿼리로 채움
+def user_participations(user_id, with_challenge=False):
+    records = [*participants_for(user_id), *archived_participations(user_id)]
+    if with_challenge:
+        challenges = Challenge.objects.in_bulk({record.challenge_id for record in records})
+        for record in records:
+            record.challenge = challenges.get(record.challenge_id)
+    records.sort(key=lambda record: record.join_data, reverse=True)
+    return records
+
+
+# participation.get_joined_challenge_ids 가 보관된 챌린지도 "참여함"으로 보도록 함께 읽음
+def _challenge_ids(columns):
+    return json.loads(zlib.decompress(bytes(columns)))['challenge_id']
+
+
+def _archive_columns(user_id):
+    return ParticipationArchive.objects.using(shard_for(user_id)).filter(user_id=user_id).values_list('columns', flat=True)
+
+
+def archived_challenge_ids(user_id):
+    return {challenge_id for columns in _archive_columns(user_id) for challenge_id in _challenge_ids(columns)}
+
+
+async def aarchived_challenge_ids(user_id):
+    return {challenge_id async for columns in _archive_columns(user_id) for challenge_id in _challenge_ids(columns)}
+
+
+# 추천 행렬(recommendations.load_matrix)용: 샤드의 보관된 (user_id, challenge_id) 쌍
+def archived_pairs(db, chunk_size=2000):
+    archives = ParticipationArchive.objects.using(db).order_by().values_list('user_id', 'columns')
+    for user_id, columns in archives.iterator(chunk_size=chunk_size):
+        for challenge_id in _challenge_ids(columns):
+            yield user_id, challenge_id
+
+
+def mark_finished(cutoff=None):
+    if cutoff is None:
+        cutoff = timezone.now() - timedelta(days=getattr(settings, 'HABIT_ARCHIVE_AFTER_DAYS', 30))
+    return Challenge.objects.filter(archive_status=Challenge.ARCHIVE_LIVE, ends_at__lte=cutoff).update(
+        archive_status=Challenge.ARCHIVE_PENDING,
+    )
+
+
+# 보관 작업이 동시에 두 번 돌아도(주기 작업 + 명령어, 다시 대기열로 돌아간 작업) 같은 행을 두 번 보관하지 않도록
+# 읽기부터 트랜잭션 안에서 하고, 지운 행 수가 읽은 행 수와 다르면(다른 쪽이 먼저 옮김) 되돌림
+def _archive_batch(db, challenge_ids, batch_size):
+    with transaction.atomic(using=db):
+        participants = list(
+            ChallengeParticipant.objects.using(db)
+            .select_for_update()
+            .filter(challenge_id__in=challenge_ids)
+            .order_by('user_id', 'pk')[:batch_size]
+        )
+        if not participants:
+            return 0
+
+        # 체크인 원장(CheckIn)은 checkin_bits 에 이미 들어 있으므로 같이 지워짐
+        _, deleted = ChallengeParticipant.objects.using(db).filter(pk__in=[p.pk for p in participants]).delete()
+        if deleted.get(ChallengeParticipant._meta.label, 0) != len(participants):
+            transaction.set_rollback(True, using=db)
+            return 0
+
+        by_user = {}
+        for participant in participants:
+            by_user.setdefault(participant.user_id, []).append(participant)
+        ParticipationArchive.objects.using(db).bulk_create([
+            ParticipationArchive(user_id=user_id, row_count=len(rows), columns=pack(rows))
+            for user_id, rows in by_user.items()
+        ])
+    return len(participants)
+
+
+def archive_finished(batch_size=2000, challenge_batch=500, cutoff=None):
+    marked = mark_finished(cutoff)
+    moved = archived = 0
+    while True:
+        challenge_ids = list(
+            Challenge.objects.filter(archive_status=Challenge.ARCHIVE_PENDING)
+            .order_by('pk').values_list('pk', flat=True)[:challenge_batch]
+        )
+        if not challenge_ids:
+            break
+        for db in each_shard():
+            while True:
+                count = _archive_batch(db, challenge_ids, batch_size)
+                if not count:
+                    break
+                moved += count
+        Challenge.objects.filter(pk__in=challenge_ids).update(archive_status=Challenge.ARCHIVE_DONE)
+        for pk in challenge_ids:
+            bump_challenge_version(pk)
+        archived += len(challenge_ids)
+    return {'marked': marked, 'challenges': archived, 'participations': moved}
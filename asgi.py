@@ -10,9 +10,27 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 import os
 
 
-# from channels.routing import ProtocolTypeRouter
+from channels.auth import AuthMiddlewareStack
+from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.security.websocket import AllowedHostsOriginValidator
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "habit_stacker.settings")
 
-application = get_asgi_application()
+# 모델을 불러오는 routing 보다 먼저 장고를 초기화해야 함
+django_asgi_app = get_asgi_application()
+
+from .routing import websocket_urlpatterns  # noqa: E402
+from .staticassets import StaticFilesASGI  # noqa: E402
+
+# 빌드된 정적 파일은 시작할 때 만든 색인으로 바로 보냄
+if getattr(settings, "HABIT_STATIC_SERVE", False):
+    django_asgi_app = StaticFilesASGI(django_asgi_app)
+
+application = ProtocolTypeRouter({
+    "http": django_asgi_app,
+    "websocket": AllowedHostsOriginValidator(
+        AuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+    ),
+})
@@ -0,0 +1,84 @@
+from functools import partial
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.cache import caches
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+# 로그인한 사용자 객체를 짧게 캐시해서 요청마다 auth_user 를 조회하지 않도록 함
+# 비밀번호 변경/로그아웃/사용자 저장 시 signals.py 에서 invalidate_user 로 지움
+# 다른 프로세스에서 지운 것도 보여야 하므로 프로세스끼리 공유하는 'shared' 캐시를 씀 (settings.CACHES)
+# 공유 캐시(Redis)가 없으면 HABIT_USER_CACHE_TIMEOUT 이 0 이라 캐시하지 않고 장고 기본 동작을 그대로 씀
+
+
+def _cache():
+    return caches['shared']
+
+
+def _user_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    _cache().delete(_user_key(user_id))
+
+
+def _timeout():
+    return getattr(settings, 'HABIT_USER_CACHE_TIMEOUT', 60)
+
+
+def _verify(user, session_hash, backend_path):
+    # 세션에 저장된 해시가 현재 비밀번호 기준과 다르면 캐시된 사용자를 쓰지 않음
+    if not session_hash or not constant_time_compare(session_hash, user.get_session_auth_hash()):
+        return None
+    user.backend = backend_path
+    return user
+
+
+def get_cached_user(request):
+    session = request.session
+    user_id = session.get(auth.SESSION_KEY)
+    backend_path = session.get(auth.BACKEND_SESSION_KEY)
+    if user_id is None or backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return auth.get_user(request)
+
+    user = _cache().get(_user_key(user_id))
+    if user is not None:
+        user = _verify(user, session.get(auth.HASH_SESSION_KEY), backend_path)
+        if user is not None:
+            return user
+
+    # 캐시에 없거나 해시가 다르면 장고 기본 검사(세션 정리 포함)를 그대로 사용
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        _cache().set(_user_key(user_id), user, _timeout())
+    return user
+
+
+async def aget_cached_user(request):
+    if not hasattr(request, '_acached_user'):
+        session = request.session
+        user_id = await session.aget(auth.SESSION_KEY)
+        backend_path = await session.aget(auth.BACKEND_SESSION_KEY)
+        user = None
+        if user_id is not None and backend_path in settings.AUTHENTICATION_BACKENDS:
+            user = await _cache().aget(_user_key(user_id))
+            if user is not None:
+                user = _verify(user, await session.aget(auth.HASH_SESSION_KEY), backend_path)
+        if user is None:
+            user = await auth.aget_user(request)
+            if user_id is not None and user.is_authenticated:
+                await _cache().aset(_user_key(user_id), user, _timeout())
+        request._acached_user = user
+    return request._acached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    def process_request(self, request):
+        super().process_request(request)
+        if _timeout() <= 0:
+            return
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+        request.auser = partial(aget_cached_user, request)
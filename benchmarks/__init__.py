@@ -0,0 +1,97 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+# manage.py bench <이름> 으로 실행할 수 있는 벤치마크 목록
+BENCHMARKS = [
+    'pagination',
+    'participation',
+    'join_race',
+    'fragments',
+    'login_hashing',
+    'async_views',
+    'search',
+    'sqlite_tuning',
+    'websocket_feed',
+    'schedule',
+    'challenge_io',
+    'login_attack',
+    'auth_requests',
+    'routes',
+    'archive',
+    'static_files',
+]
+
+
+@contextmanager
+def scratch_database(sqlite_file=None):
+    # 개발 DB를 건드리지 않도록 임시 테스트 DB를 만들어서 돌리고 끝나면 지움
+    # SQLite 테스트 DB는 settings 의 TEST NAME 파일을 씀, 다른 파일(예: 임시 디렉터리)에서 재려면 sqlite_file 로 지정
+    from django.db import connection
+    from django.test.utils import (
+        setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+    )
+
+    if sqlite_file is not None:
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = str(sqlite_file)
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def build_challenge(spread_days=0, **fields):
+    # bulk_create 용 Challenge 객체 (save() 를 거치지 않으므로 일정 필드를 직접 채움)
+    from django.utils import timezone
+
+    from ..models import Challenge
+
+    fields.setdefault('category', random.choice(Challenge.CATEGORY_CHOICES)[0])
+    fields.setdefault('duration', random.choice(Challenge.DURATION_CHOICES)[0])
+    fields.setdefault('title', f'Challenge {random.randrange(10 ** 9)}')
+    fields.setdefault('description', 'Synthetic challenge for benchmarking.')
+    fields.setdefault('starts_at', timezone.now() - timedelta(seconds=random.uniform(0, spread_days * 86400)))
+    challenge = Challenge(**fields)
+    challenge.sync_schedule()
+    return challenge
+
+
+def seed_challenges(count, batch_size=5000, spread_days=0):
+    from ..models import Challenge
+
+    remaining = count
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        Challenge.objects.bulk_create([build_challenge(spread_days) for _ in range(size)])
+        remaining -= size
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))]
+
+    return {
+        'n': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered), 3),
+        'p50_ms': round(percentile(50), 3),
+        'p95_ms': round(percentile(95), 3),
+        'p99_ms': round(percentile(99), 3),
+    }
+
+
+def measure(fn, repeat=30, warmup=3):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
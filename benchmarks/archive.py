@@ -0,0 +1,104 @@
+"""끝난 챌린지의 참여 기록을 보관하기 전/후의 참여 테이블 조회 지연시간 비교"""
+import random
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connections
+from django.utils import timezone
+
+from ..archive import archive_finished, user_participations
+from ..models import Challenge, ChallengeParticipant, ParticipationArchive
+from ..routers import each_shard, participants_for, shard_for
+from . import build_challenge, measure, scratch_database
+
+
+def add_arguments(parser):
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--challenges', type=int, default=5000)
+    parser.add_argument('--participations', type=int, default=500_000)
+    parser.add_argument('--finished', type=float, default=0.9, help='이미 끝난 챌린지 비율')
+    parser.add_argument('--repeat', type=int, default=300)
+
+
+def seed(options):
+    finished = int(options['challenges'] * options['finished'])
+    long_ago = timezone.now() - timedelta(days=120)
+    Challenge.objects.bulk_create(
+        [build_challenge(starts_at=long_ago) for _ in range(finished)]
+        + [build_challenge() for _ in range(options['challenges'] - finished)]
+    )
+    User.objects.bulk_create(
+        User(username=f'bench{i}', email=f'bench{i}@example.com', password='!') for i in range(options['users'])
+    )
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    challenge_ids = list(Challenge.objects.values_list('pk', flat=True))
+    for start in range(0, options['participations'], 5000):
+        by_shard = {}
+        for _ in range(min(5000, options['participations'] - start)):
+            user_id = random.choice(user_ids)
+            by_shard.setdefault(shard_for(user_id), []).append(ChallengeParticipant(
+                user_id=user_id, challenge_id=random.choice(challenge_ids), is_verified=random.random() < 0.3,
+            ))
+        for db, rows in by_shard.items():
+            ChallengeParticipant.objects.using(db).bulk_create(rows, ignore_conflicts=True)
+    active_ids = list(Challenge.objects.active().values_list('pk', flat=True))
+    return user_ids, active_ids
+
+
+# 샤드가 있으면 모든 샤드의 크기를 더함
+def table_bytes(table):
+    total = 0
+    for db in each_shard():
+        connection = connections[db]
+        if connection.vendor != 'sqlite':
+            return None
+        with connection.cursor() as cursor:
+            try:
+                cursor.execute('SELECT SUM(pgsize) FROM dbstat WHERE name = %s', [table])
+            except Exception:
+                return None
+            total += cursor.fetchone()[0] or 0
+    return total
+
+
+def count_rows(model, **filters):
+    return sum(model.objects.using(db).filter(**filters).count() for db in each_shard())
+
+
+def run(options):
+    results = []
+    with scratch_database():
+        user_ids, active_ids = seed(options)
+        cases = {
+            # 참여 여부 캐시가 비었을 때 읽는 사용자별 참여 챌린지 id 목록
+            'joined_ids': lambda: list(participants_for(random.choice(user_ids)).values_list('challenge_id', flat=True)),
+            # get_or_create / 체크인 전에 하는 (사용자, 챌린지) 조회
+            'participant_lookup': lambda: participants_for(random.choice(user_ids)).filter(
+                challenge_id=random.choice(active_ids),
+            ).exists(),
+            # 진행 중인 챌린지의 미인증 참가자 수 (리마인더 등)
+            'unverified_count': lambda: count_rows(
+                ChallengeParticipant, challenge_id=random.choice(active_ids), is_verified=False,
+            ),
+        }
+
+        def snapshot(mode):
+            rows = count_rows(ChallengeParticipant)
+            size = table_bytes(ChallengeParticipant._meta.db_table)
+            for case, fn in cases.items():
+                results.append({
+                    'mode': mode, 'case': case, 'hot_rows': rows, 'hot_table_bytes': size,
+                    **measure(fn, options['repeat']),
+                })
+
+        snapshot('before')
+        archived = archive_finished()
+        snapshot('after')
+        results.append({
+            'mode': 'after', 'case': 'user_history (hot + archive)',
+            'archived_participations': archived['participations'],
+            'archive_rows': count_rows(ParticipationArchive),
+            'archive_table_bytes': table_bytes(ParticipationArchive._meta.db_table),
+            **measure(lambda: user_participations(random.choice(user_ids)), options['repeat']),
+        })
+    return results
@@ -0,0 +1,61 @@
+"""동시 접속 수백 개에서 sync 뷰와 async 뷰의 처리량/지연시간 비교 (ASGI 핸들러 사용)"""
+import asyncio
+import time
+
+from django.test import AsyncClient, override_settings
+from django.urls import include, path
+
+from .. import views
+from ..models import Challenge
+from . import scratch_database, seed_challenges, summarize
+
+# 두 버전을 같은 조건에서 부르기 위한 URLConf
+urlpatterns = [
+    path('sync/', views.main_page),
+    path('sync/<int:pk>/', views.single_challenge_page),
+    path('async/', views.amain_page),
+    path('async/<int:pk>/', views.asingle_challenge_page),
+    path('', include('habit_stacker.urls')),
+]
+
+
+def add_arguments(parser):
+    parser.add_argument('--challenges', type=int, default=10_000)
+    parser.add_argument('--concurrency', type=int, default=300)
+    parser.add_argument('--requests', type=int, default=3000)
+
+
+async def _drive(urls, concurrency, total):
+    client = AsyncClient()
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def hit(i):
+        async with semaphore:
+            start = time.perf_counter()
+            await client.get(urls[i % len(urls)])
+            samples.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(hit(i) for i in range(total)))
+    return samples, time.perf_counter() - start
+
+
+def run(options):
+    results = []
+    with scratch_database(), override_settings(ROOT_URLCONF=__name__, HABIT_FRAGMENT_CACHE=False):
+        seed_challenges(options['challenges'])
+        pks = list(Challenge.objects.order_by('-pk').values_list('pk', flat=True)[:100])
+        for mode in ('sync', 'async'):
+            pages = {
+                'main_page': [f'/{mode}/'],
+                'single_challenge_page': [f'/{mode}/{pk}/' for pk in pks],
+            }
+            for name, urls in pages.items():
+                samples, elapsed = asyncio.run(_drive(urls, options['concurrency'], options['requests']))
+                results.append({
+                    'view': name, 'mode': mode, 'concurrency': options['concurrency'],
+                    'requests_per_sec': round(options['requests'] / elapsed, 1),
+                    **summarize(samples),
+                })
+    return results
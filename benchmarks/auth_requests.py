@@ -0,0 +1,54 @@
+"""로그인한 사용자의 main_page 요청당 쿼리 수와 처리량 (DB 세션 vs 캐시 세션 + 사용자 캐시)"""
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import scratch_database, seed_challenges
+
+CACHED_MIDDLEWARE = 'habit_stacker.authcache.CachedAuthenticationMiddleware'
+DEFAULT_MIDDLEWARE = 'django.contrib.auth.middleware.AuthenticationMiddleware'
+
+
+def add_arguments(parser):
+    parser.add_argument('--requests', type=int, default=2000)
+
+
+def run(options):
+    results = []
+    modes = {
+        'db': ('django.contrib.sessions.backends.db', [
+            DEFAULT_MIDDLEWARE if name == CACHED_MIDDLEWARE else name for name in settings.MIDDLEWARE
+        ]),
+        'cached': ('django.contrib.sessions.backends.cached_db', settings.MIDDLEWARE),
+    }
+    with scratch_database():
+        seed_challenges(500)
+        user = User.objects.create_user('member', 'member@example.com', 'member-password')
+        url = reverse('main_page')
+
+        for mode, (engine, middleware) in modes.items():
+            with override_settings(
+                SESSION_ENGINE=engine, SESSION_CACHE_ALIAS='shared', MIDDLEWARE=middleware, HABIT_USER_CACHE_TIMEOUT=60,
+            ):
+                cache.clear()
+                caches['shared'].clear()
+                client = Client()
+                client.force_login(user)
+                client.get(url)
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    for _ in range(options['requests']):
+                        client.get(url)
+                    elapsed = time.perf_counter() - start
+                results.append({
+                    'sessions': mode,
+                    'requests_per_sec': round(options['requests'] / elapsed, 1),
+                    'queries_per_request': round(len(queries) / options['requests'], 2),
+                })
+    return results
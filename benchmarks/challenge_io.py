@@ -0,0 +1,65 @@
+"""CSV 가져오기/내보내기 처리량과 최대 메모리 사용량 (기본 100만 행)"""
+import csv
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from ..challenge_io import export_lines, import_challenges
+from ..models import Challenge
+from . import scratch_database
+
+
+def add_arguments(parser):
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--batch-size', type=int, default=2000)
+    parser.add_argument('--invalid-ratio', type=float, default=0.01, help='일부러 넣는 잘못된 행 비율')
+
+
+def _write_source(path, rows, invalid_ratio):
+    categories = [value for value, _ in Challenge.CATEGORY_CHOICES]
+    durations = [value for value, _ in Challenge.DURATION_CHOICES]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['title', 'description', 'duration', 'category'])
+        for i in range(rows):
+            category = 'Unknown' if random.random() < invalid_ratio else random.choice(categories)
+            writer.writerow([f'Imported {i}', 'Seeded by the import benchmark.', random.choice(durations), category])
+
+
+def _timed(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run(options):
+    results = []
+    with tempfile.TemporaryDirectory() as directory, scratch_database():
+        source = Path(directory) / 'challenges.csv'
+        _write_source(source, options['rows'], options['invalid_ratio'])
+
+        with open(source, encoding='utf-8', newline='') as f:
+            (created, failed), elapsed, peak = _timed(lambda: import_challenges(f, 'csv', options['batch_size']))
+        results.append({
+            'step': 'import', 'rows': options['rows'], 'created': created, 'failed': failed,
+            'rows_per_sec': round(options['rows'] / elapsed, 1), 'peak_memory_mb': round(peak / 2 ** 20, 1),
+        })
+
+        target = Path(directory) / 'export.csv'
+
+        def export():
+            with open(target, 'w', encoding='utf-8', newline='') as f:
+                f.writelines(export_lines(fmt='csv', chunk_size=options['batch_size']))
+
+        _, elapsed, peak = _timed(export)
+        results.append({
+            'step': 'export', 'rows': created, 'rows_per_sec': round(created / elapsed, 1),
+            'peak_memory_mb': round(peak / 2 ** 20, 1),
+        })
+    return results
@@ -0,0 +1,46 @@
+"""익명 메인/상세 페이지의 초당 요청 수 비교 (조각 캐시 on/off)"""
+import time
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Challenge
+from . import scratch_database, seed_challenges
+
+
+def add_arguments(parser):
+    parser.add_argument('--challenges', type=int, default=10_000)
+    parser.add_argument('--requests', type=int, default=2000)
+
+
+def run(options):
+    results = []
+    with scratch_database():
+        seed_challenges(options['challenges'])
+        pks = list(Challenge.objects.order_by('-pk').values_list('pk', flat=True)[:50])
+        paths = {
+            'main_page': [reverse('main_page')],
+            'single_challenge_page': [reverse('single_challenge_page', kwargs={'pk': pk}) for pk in pks],
+        }
+
+        for enabled in (False, True):
+            with override_settings(HABIT_FRAGMENT_CACHE=enabled):
+                caches['fragments'].clear()
+                for name, urls in paths.items():
+                    client = Client()
+                    for url in urls:
+                        client.get(url)  # 캐시 채우기
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        for i in range(options['requests']):
+                            client.get(urls[i % len(urls)])
+                        elapsed = time.perf_counter() - start
+                    results.append({
+                        'view': name, 'cache': 'on' if enabled else 'off',
+                        'requests_per_sec': round(options['requests'] / elapsed, 1),
+                        'queries_per_request': round(len(queries) / options['requests'], 2),
+                    })
+    return results
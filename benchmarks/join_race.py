@@ -0,0 +1,77 @@
+"""여러 스레드가 joined_challenge 엔드포인트를 동시에 호출해도 (user, challenge) 행이 하나인지 확인"""
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from ..models import Challenge, ChallengeParticipant
+from ..participation import bulk_join
+from . import scratch_database, seed_challenges, summarize
+
+
+def add_arguments(parser):
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--hits', type=int, default=10, help='스레드당 요청 수')
+    parser.add_argument('--cohort', type=int, default=10_000, help='bulk_join 으로 등록할 사용자 수')
+
+
+def run(options):
+    results = []
+    with scratch_database():
+        seed_challenges(1)
+        challenge = Challenge.objects.get()
+        users = [
+            User.objects.create_user(f'race{i}', f'race{i}@example.com', 'race-password')
+            for i in range(options['users'])
+        ]
+        url = reverse('joined_challenge', kwargs={'pk': challenge.pk})
+        samples, errors = [], []
+        barrier = threading.Barrier(options['threads'])
+
+        def worker(index):
+            client = Client()
+            try:
+                barrier.wait()
+                for hit in range(options['hits']):
+                    client.force_login(users[(index + hit) % len(users)])
+                    start = time.perf_counter()
+                    client.get(url)
+                    samples.append((time.perf_counter() - start) * 1000)
+            except Exception as e:
+                errors.append(repr(e))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        rows = ChallengeParticipant.objects.filter(challenge=challenge).count()
+        results.append({
+            'case': 'endpoint', 'users': len(users), 'rows': rows,
+            'one_row_per_pair': rows == len(users), 'errors': len(errors),
+            **summarize(samples or [0.0]),
+        })
+
+        cohort = [
+            User(username=f'cohort{i}', email=f'cohort{i}@example.com')
+            for i in range(options['cohort'])
+        ]
+        User.objects.bulk_create(cohort, batch_size=1000)
+        cohort_ids = list(User.objects.filter(username__startswith='cohort').values_list('pk', flat=True))
+        start = time.perf_counter()
+        bulk_join(challenge, cohort_ids)
+        bulk_join(challenge, cohort_ids) # 두 번 호출해도 중복이 생기지 않아야 함
+        elapsed = (time.perf_counter() - start) * 1000
+        rows = ChallengeParticipant.objects.filter(challenge=challenge).count()
+        results.append({
+            'case': 'bulk_join', 'users': len(users) + len(cohort_ids), 'rows': rows,
+            'one_row_per_pair': rows == len(users) + len(cohort_ids), 'elapsed_ms': round(elapsed, 3),
+        })
+    return results
@@ -0,0 +1,74 @@
+"""로그인 무차별 대입 공격 중 정상 사용자의 로그인 지연시간 (요청 제한 on/off)"""
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from . import scratch_database, summarize
+
+
+def add_arguments(parser):
+    parser.add_argument('--attackers', type=int, default=8)
+    parser.add_argument('--logins', type=int, default=50, help='정상 사용자 수 (각자 다른 IP 에서 한 번씩 로그인)')
+
+
+def _attack(url, stop, counts, index):
+    client = Client(REMOTE_ADDR=f'10.0.0.{index + 1}')
+    try:
+        while not stop.is_set():
+            response = client.post(url, {'email': 'victim@example.com', 'password': 'wrong-password'})
+            counts['rejected' if response.status_code == 429 else 'attempts'] += 1
+    finally:
+        connection.close()
+
+
+def run(options):
+    results = []
+    url = reverse('login')
+    with scratch_database():
+        # 정상 사용자는 각자 다른 계정/IP 로 한 번씩 로그인하므로 이메일/IP 버킷 한도에 걸리지 않아야 함
+        for i in range(options['logins']):
+            User.objects.create_user(f'member{i}', f'member{i}@example.com', 'member-password')
+        User.objects.create_user('victim', 'victim@example.com', 'victim-password')
+
+        for enabled in (False, True):
+            with override_settings(HABIT_RATE_LIMIT_ENABLED=enabled, HABIT_FRAGMENT_CACHE=False):
+                caches['ratelimit'].clear()
+                stop = threading.Event()
+                counts = {'attempts': 0, 'rejected': 0}
+                attackers = [
+                    threading.Thread(target=_attack, args=(url, stop, counts, i))
+                    for i in range(options['attackers'])
+                ]
+                for thread in attackers:
+                    thread.start()
+
+                samples = []
+                member = {'ok': 0, 'rejected': 0, 'failed': 0}
+                for i in range(options['logins']):
+                    client = Client(REMOTE_ADDR=f'192.168.{i // 250}.{i % 250 + 1}')
+                    start = time.perf_counter()
+                    response = client.post(url, {'email': f'member{i}@example.com', 'password': 'member-password'})
+                    samples.append((time.perf_counter() - start) * 1000)
+                    # 성공하면 main_page 로 리디렉트(302), 요청 제한이면 429, 그 외(200)는 로그인 실패
+                    if response.status_code == 302:
+                        member['ok'] += 1
+                    elif response.status_code == 429:
+                        member['rejected'] += 1
+                    else:
+                        member['failed'] += 1
+
+                stop.set()
+                for thread in attackers:
+                    thread.join()
+                results.append({
+                    'rate_limit': 'on' if enabled else 'off', 'attackers': options['attackers'],
+                    'attack_attempts': counts['attempts'], 'attack_rejected': counts['rejected'],
+                    'member_ok': member['ok'], 'member_rejected': member['rejected'], 'member_failed': member['failed'],
+                    **summarize(samples),
+                })
+    return results
@@ -0,0 +1,58 @@
+"""동시 로그인 시 bcrypt 확인 지연시간 (프로세스 풀 사용/미사용) 비교
+
+로그인 경로와 같은 장고 hashers.acheck_password / make_password (PASSWORD_HASHERS 의 첫 번째 해셔) 를 호출함
+"""
+import asyncio
+import time
+
+from django.contrib.auth.hashers import acheck_password, make_password
+from django.test import override_settings
+
+from .. import hashing
+from . import summarize
+
+
+def add_arguments(parser):
+    parser.add_argument('--logins', type=int, default=64, help='동시에 들어오는 로그인 수')
+    parser.add_argument('--rounds', type=int, default=12)
+    parser.add_argument('--pool-size', type=int, default=None)
+
+
+async def _login_burst(hashed, count):
+    samples = []
+
+    async def login():
+        start = time.perf_counter()
+        assert await acheck_password('correct horse battery staple', hashed)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    # 로그인과 함께 다른 요청을 흉내내는 짧은 작업의 지연(이벤트 루프가 막힌 시간)도 잼
+    lag = []
+
+    async def heartbeat():
+        while len(samples) < count:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lag.append((time.perf_counter() - start) * 1000 - 5)
+
+    start = time.perf_counter()
+    await asyncio.gather(heartbeat(), *(login() for _ in range(count)))
+    return samples, lag, time.perf_counter() - start
+
+
+def run(options):
+    results = []
+    for label, pool_size in (('inline', 0), ('pool', options['pool_size'])):
+        with override_settings(HABIT_BCRYPT_ROUNDS=options['rounds'], HABIT_BCRYPT_POOL_SIZE=pool_size):
+            hashing.shutdown_executor()
+            hashed = make_password('correct horse battery staple')
+            samples, lag, elapsed = asyncio.run(_login_burst(hashed, options['logins']))
+            hashing.shutdown_executor()
+        lag_summary = summarize(lag or [0.0])
+        results.append({
+            'mode': label, 'logins': options['logins'], 'rounds': options['rounds'],
+            'logins_per_sec': round(options['logins'] / elapsed, 1),
+            **summarize(samples),
+            'loop_lag_p99_ms': lag_summary['p99_ms'],
+        })
+    return results
@@ -0,0 +1,43 @@
+"""OFFSET 페이지네이션과 커서 페이지네이션의 페이지 지연시간 비교"""
+from django.core.paginator import Paginator
+
+from ..models import Challenge
+from ..pagination import CursorPaginator, encode_cursor
+from ..views import ChallengeList
+from . import measure, scratch_database, seed_challenges
+
+
+def add_arguments(parser):
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=30)
+
+
+def run(options):
+    per_page = ChallengeList.paginate_by
+    results = []
+    with scratch_database():
+        seeded = 0
+        for size in sorted(options['sizes']):
+            seed_challenges(size - seeded)
+            seeded = size
+            queryset = Challenge.objects.all()
+            ordered = queryset.order_by('-pk')
+
+            for label, depth in (('first', 0), ('middle', size // 2), ('last', size - per_page)):
+                page_number = depth // per_page + 1
+                # 같은 위치를 커서로 가리키려면 바로 앞 행의 pk가 필요함
+                boundary = ordered.values_list('pk', flat=True)[depth - 1] if depth else None
+                token = encode_cursor(boundary, 'n') if boundary else None
+
+                def offset_page():
+                    list(Paginator(ordered, per_page).page(page_number).object_list)
+
+                def cursor_page():
+                    list(CursorPaginator(queryset, per_page).page(token).object_list)
+
+                for mode, fn in (('offset', offset_page), ('cursor', cursor_page)):
+                    results.append({
+                        'rows': size, 'page': label, 'mode': mode,
+                        **measure(fn, options['repeat']),
+                    })
+    return results
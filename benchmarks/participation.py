@@ -0,0 +1,52 @@
+"""single_challenge_page 참여 여부 확인의 요청당 쿼리 수 비교 (기존 exists() vs 캐시)"""
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Challenge, ChallengeParticipant
+from ..participation import has_joined
+from . import measure, scratch_database, seed_challenges
+
+
+def add_arguments(parser):
+    parser.add_argument('--challenges', type=int, default=1000)
+    parser.add_argument('--joined', type=int, default=50, help='사용자가 참여한 챌린지 수')
+    parser.add_argument('--repeat', type=int, default=200)
+
+
+def legacy_check(user, pk):
+    challenge = Challenge.objects.get(pk=pk)
+    ChallengeParticipant.objects.filter(user=user, challenge=challenge).exists()
+
+
+def cached_check(user, pk):
+    if not has_joined(user, pk):
+        Challenge.objects.get(pk=pk)
+
+
+def run(options):
+    results = []
+    with scratch_database():
+        seed_challenges(options['challenges'])
+        user = User.objects.create_user('bench', 'bench@example.com', 'bench-password')
+        pks = list(Challenge.objects.values_list('pk', flat=True))
+        ChallengeParticipant.objects.bulk_create(
+            ChallengeParticipant(user=user, challenge_id=pk) for pk in pks[:options['joined']]
+        )
+        cases = {'joined': pks[0], 'not_joined': pks[-1]}
+
+        for mode, check in (('before', legacy_check), ('after', cached_check)):
+            for case, pk in cases.items():
+                caches['shared'].clear()
+                # 첫 요청(캐시 비어 있음)과 이후 요청의 쿼리 수를 따로 기록
+                with CaptureQueriesContext(connection) as cold:
+                    check(user, pk)
+                with CaptureQueriesContext(connection) as warm:
+                    check(user, pk)
+                results.append({
+                    'mode': mode, 'case': case,
+                    'queries_cold': len(cold), 'queries_warm': len(warm),
+                    **measure(lambda: check(user, pk), options['repeat']),
+                })
+    return results
@@ -0,0 +1,221 @@
+"""urls.py 의 모든 경로를 wsgi.application / asgi.application 으로 동시에 호출해서 처리량, 지연시간, 요청당 쿼리 수를 측정
+
+커밋 사이 비교용: manage.py bench --json routes > before.json
+"""
+import asyncio
+import io
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import URLPattern, reverse
+
+from .. import urls
+from ..metrics import registry
+from ..models import Challenge, ChallengeParticipant
+from ..participation import counter_subqueries
+from . import scratch_database, seed_challenges, summarize
+
+PASSWORD = 'bench-password'
+CSRF_TOKEN = 'b' * 32  # 마스킹하지 않은 32자 토큰은 쿠키 값과 그대로 비교됨
+
+
+def add_arguments(parser):
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--challenges', type=int, default=10_000)
+    parser.add_argument('--participations', type=int, default=50_000)
+    parser.add_argument('--requests', type=int, default=500, help='경로마다 보낼 요청 수')
+    parser.add_argument('--workers', type=int, default=8, help='WSGI 스레드 수')
+    parser.add_argument('--concurrency', type=int, default=64, help='ASGI 동시 요청 수')
+    parser.add_argument('--interfaces', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+
+
+def seed(options):
+    seed_challenges(options['challenges'])
+    User.objects.create_user('bench0', 'bench0@example.com', PASSWORD)
+    User.objects.bulk_create(
+        User(username=f'bench{i}', email=f'bench{i}@example.com', password='!')
+        for i in range(1, options['users'])
+    )
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    challenge_ids = list(Challenge.objects.values_list('pk', flat=True))
+    for start in range(0, options['participations'], 5000):
+        ChallengeParticipant.objects.bulk_create(
+            [
+                ChallengeParticipant(user_id=random.choice(user_ids), challenge_id=random.choice(challenge_ids))
+                for _ in range(min(5000, options['participations'] - start))
+            ],
+            ignore_conflicts=True,
+        )
+    Challenge.objects.update(**counter_subqueries())
+    return challenge_ids
+
+
+def build_requests(challenge_ids, session_cookie):
+    """경로 이름마다 (method, path, query, body, cookie) 를 만드는 함수"""
+    member = f'{settings.SESSION_COOKIE_NAME}={session_cookie}; {settings.CSRF_COOKIE_NAME}={CSRF_TOKEN}'
+    anonymous = f'{settings.CSRF_COOKIE_NAME}={CSRF_TOKEN}'
+    special = {
+        'search': lambda: ('GET', reverse('search'), urlencode({'q': 'Challenge'}), b'', member),
+        'login': lambda: ('POST', reverse('login'), '', urlencode({
+            'email': 'bench0@example.com', 'password': PASSWORD, 'csrfmiddlewaretoken': CSRF_TOKEN,
+        }).encode(), anonymous),
+        'check_in': lambda: ('POST', reverse('check_in', kwargs={'pk': random.choice(challenge_ids)}), '', urlencode({
+            'csrfmiddlewaretoken': CSRF_TOKEN,
+        }).encode(), member),
+        # 로그아웃은 세션을 지우므로 익명으로 호출
+        'logout': lambda: ('GET', reverse('logout'), '', b'', anonymous),
+    }
+    routes = {}
+    for pattern in urls.urlpatterns:
+        if not isinstance(pattern, URLPattern) or not pattern.name:
+            continue
+        name = pattern.name
+        if name in special:
+            routes[name] = special[name]
+        elif 'pk' in pattern.pattern.converters:
+            routes[name] = lambda name=name: (
+                'GET', reverse(name, kwargs={'pk': random.choice(challenge_ids)}), '', b'', member,
+            )
+        else:
+            routes[name] = lambda name=name: ('GET', reverse(name), '', b'', member)
+    routes['main_page (anonymous)'] = lambda: ('GET', reverse('main_page'), '', b'', '')
+    return routes
+
+
+def wsgi_call(application, method, path, query, body, cookie):
+    environ = {
+        'REQUEST_METHOD': method, 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'testserver', 'REMOTE_ADDR': '127.0.0.1', 'HTTP_COOKIE': cookie,
+        'CONTENT_TYPE': 'application/x-www-form-urlencoded', 'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body), 'wsgi.errors': sys.stderr, 'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http', 'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+    status = []
+    result = application(environ, lambda s, headers, exc_info=None: status.append(int(s.split()[0])))
+    try:
+        for _ in result:
+            pass
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return status[0]
+
+
+async def asgi_call(application, method, path, query, body, cookie):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method, 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query.encode(), 'root_path': '',
+        'headers': [
+            (b'host', b'testserver'), (b'cookie', cookie.encode()),
+            (b'content-type', b'application/x-www-form-urlencoded'), (b'content-length', str(len(body)).encode()),
+        ],
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    pending = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    disconnected = asyncio.Event()
+    status = []
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await application(scope, receive, send)
+    disconnected.set()
+    return status[0]
+
+
+def drive_wsgi(application, make_request, total, workers):
+    samples, statuses = [], []
+    lock = threading.Lock()
+
+    def hit(_):
+        request = make_request()
+        start = time.perf_counter()
+        status = wsgi_call(application, *request)
+        with lock:
+            samples.append((time.perf_counter() - start) * 1000)
+            statuses.append(status)
+
+    def close_connection(_):
+        connection.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        list(pool.map(hit, range(total)))
+        elapsed = time.perf_counter() - start
+        list(pool.map(close_connection, range(workers)))
+    return samples, statuses, elapsed
+
+
+def drive_asgi(application, make_request, total, concurrency):
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        samples, statuses = [], []
+
+        async def hit():
+            async with semaphore:
+                request = make_request()
+                start = time.perf_counter()
+                statuses.append(await asgi_call(application, *request))
+                samples.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(hit() for _ in range(total)))
+        return samples, statuses, time.perf_counter() - start
+
+    return asyncio.run(main())
+
+
+def _queries_per_request(view_name):
+    histogram = registry.histograms.get(('habit_request_sql_queries', (('view', view_name),)))
+    if histogram is None or not histogram.count:
+        return None
+    return round(histogram.total / histogram.count, 2)
+
+
+def run(options):
+    results = []
+    with scratch_database(), override_settings(HABIT_RATE_LIMIT_ENABLED=False, HABIT_METRICS_SAMPLE_RATE=1.0):
+        challenge_ids = seed(options)
+        client = Client()
+        client.force_login(User.objects.get(username='bench0'))
+        routes = build_requests(challenge_ids, client.cookies[settings.SESSION_COOKIE_NAME].value)
+
+        for interface in options['interfaces']:
+            if interface == 'wsgi':
+                from ..wsgi import application
+
+                def drive(make_request):
+                    return drive_wsgi(application, make_request, options['requests'], options['workers'])
+            else:
+                from ..asgi import application
+
+                def drive(make_request):
+                    return drive_asgi(application, make_request, options['requests'], options['concurrency'])
+
+            for route, make_request in routes.items():
+                registry.reset()
+                samples, statuses, elapsed = drive(make_request)
+                results.append({
+                    'interface': interface, 'route': route,
+                    'requests_per_sec': round(len(samples) / elapsed, 1),
+                    **summarize(samples),
+                    'queries_per_request': _queries_per_request(route.split(' ')[0]),
+                    'server_errors': sum(status >= 500 for status in statuses),
+                })
+    return results
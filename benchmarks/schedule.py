@@ -0,0 +1,55 @@
+"""'진행 중'/'곧 종료' 조회: duration 문자열을 행마다 해석하는 방식과 ends_at 인덱스 범위 조회 비교"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ..models import Challenge, ChallengeQuerySet
+from . import measure, scratch_database, seed_challenges
+
+
+def add_arguments(parser):
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=20)
+
+
+# 예전 방식: 모든 행을 읽어서 'For 2 weeks' 같은 문자열을 파이썬에서 해석
+def _parse_days(duration):
+    count = int(duration.split()[1])
+    return count * 7
+
+
+def string_active(now):
+    rows = Challenge.objects.order_by('-pk').values_list('pk', 'duration', 'starts_at')
+    return [pk for pk, duration, starts_at in rows if starts_at <= now < starts_at + timedelta(days=_parse_days(duration))][:12]
+
+
+def string_ending_soon(now):
+    rows = Challenge.objects.order_by('-pk').values_list('pk', 'duration', 'starts_at')
+    soon = now + ChallengeQuerySet.ENDING_SOON
+    result = []
+    for pk, duration, starts_at in rows:
+        ends_at = starts_at + timedelta(days=_parse_days(duration))
+        if starts_at <= now < ends_at <= soon:
+            result.append(pk)
+    return result[:12]
+
+
+def run(options):
+    results = []
+    with scratch_database():
+        seed_challenges(options['rows'], spread_days=90)
+        now = timezone.now()
+        cases = {
+            'active': (
+                lambda: string_active(now),
+                lambda: list(Challenge.objects.active(now).order_by('-pk').values_list('pk', flat=True)[:12]),
+            ),
+            'ending_soon': (
+                lambda: string_ending_soon(now),
+                lambda: list(Challenge.objects.ending_soon(now).order_by('-pk').values_list('pk', flat=True)[:12]),
+            ),
+        }
+        for name, (string_version, indexed_version) in cases.items():
+            for mode, fn in (('string', string_version), ('indexed', indexed_version)):
+                results.append({'rows': options['rows'], 'filter': name, 'mode': mode, **measure(fn, options['repeat'])})
+    return results
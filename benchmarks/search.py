@@ -0,0 +1,59 @@
+"""전문 검색 인덱스와 icontains 테이블 스캔의 검색 지연시간 비교"""
+import random
+
+from django.db.models import Q
+
+from ..models import Challenge
+from ..search import get_backend
+from . import build_challenge, measure, scratch_database
+
+WORDS = [
+    'running', 'walking', 'water', 'sleep', 'reading', 'journal', 'yoga', 'meditation',
+    'recycle', 'plastic', 'vegetable', 'stretch', 'guitar', 'drawing', 'gratitude', 'cycling',
+]
+
+
+def add_arguments(parser):
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=50)
+
+
+def _seed(count, batch_size=5000):
+    for start in range(0, count, batch_size):
+        Challenge.objects.bulk_create([
+            build_challenge(
+                title=' '.join(random.sample(WORDS, 2)) + f' {i}',
+                description=' '.join(random.choices(WORDS, k=12)),
+            )
+            for i in range(start, min(start + batch_size, count))
+        ])
+
+
+def run(options):
+    results = []
+    with scratch_database():
+        _seed(options['rows'])
+        backend = get_backend()
+        queries = {
+            # 실제로 잘 안 겹치는 단어 조합
+            'rare': f"{WORDS[0]} {WORDS[5]} {options['rows'] // 2}",
+            # 설명에 단어 12개를 뽑으므로 절반 넘는 행에 들어 있는 흔한 단어
+            'common': WORDS[2],
+        }
+        for term, query in queries.items():
+            def indexed():
+                backend.search(query, limit=20)
+
+            def indexed_with_facets():
+                backend.search(query, category='Health', limit=20)
+                backend.facets(query)
+
+            def scan():
+                condition = Q()
+                for word in query.split():
+                    condition &= Q(title__icontains=word) | Q(description__icontains=word)
+                list(Challenge.objects.filter(condition)[:20])
+
+            for mode, fn in (('fts', indexed), ('fts+facets', indexed_with_facets), ('icontains', scan)):
+                results.append({'rows': options['rows'], 'term': term, 'mode': mode, **measure(fn, options['repeat'])})
+    return results
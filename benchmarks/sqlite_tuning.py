@@ -0,0 +1,84 @@
+"""읽기/쓰기가 섞인 부하에서 SQLite 튜닝(WAL, busy_timeout 등) 전후의 처리량과 잠금 오류 비율 비교"""
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import OperationalError, connection
+from django.test import override_settings
+
+from ..models import Challenge
+from ..participation import join_challenge
+from . import scratch_database, seed_challenges
+
+
+def add_arguments(parser):
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+
+
+def _load(options, users, pks):
+    counts = {'reads': 0, 'writes': 0, 'locked': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + options['seconds']
+
+    def worker():
+        local = dict.fromkeys(counts, 0)
+        try:
+            while time.perf_counter() < deadline:
+                try:
+                    if random.random() < options['write_ratio']:
+                        join_challenge(random.choice(users), Challenge(pk=random.choice(pks)))
+                        local['writes'] += 1
+                    else:
+                        list(Challenge.objects.order_by('-pk')[:13])
+                        local['reads'] += 1
+                except OperationalError as e:
+                    local['locked' if 'locked' in str(e) else 'errors'] += 1
+        finally:
+            connection.close()
+            with lock:
+                for key, value in local.items():
+                    counts[key] += value
+
+    threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def run(options):
+    results = []
+    tuned_options = connection.settings_dict.get('OPTIONS', {})
+    modes = (
+        ('default', {}, {k: v for k, v in tuned_options.items() if k != 'transaction_mode'}),
+        ('tuned', settings.HABIT_SQLITE_PRAGMAS, tuned_options),
+    )
+    for mode, pragmas, db_options in modes:
+        # 기본 모드는 BEGIN IMMEDIATE 없이 (DEFERRED 트랜잭션) 돌림
+        connection.settings_dict['OPTIONS'] = db_options
+        with tempfile.TemporaryDirectory() as directory, override_settings(HABIT_SQLITE_PRAGMAS=pragmas):
+            with scratch_database(sqlite_file=Path(directory) / 'bench.sqlite3'):
+                seed_challenges(500)
+                users = list(User.objects.bulk_create(
+                    User(username=f'load{i}', email=f'load{i}@example.com') for i in range(2000)
+                ))
+                pks = list(Challenge.objects.values_list('pk', flat=True))
+                connection.close()
+
+                counts = _load(options, users, pks)
+                attempts = sum(counts.values())
+                results.append({
+                    'mode': mode, 'threads': options['threads'],
+                    'ops_per_sec': round((counts['reads'] + counts['writes']) / options['seconds'], 1),
+                    **counts,
+                    'lock_error_rate': round(counts['locked'] / attempts, 4) if attempts else 0.0,
+                })
+    connection.settings_dict['OPTIONS'] = tuned_options
+    return results
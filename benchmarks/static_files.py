@@ -0,0 +1,116 @@
+"""정적 파일 서빙: 색인 조회, 미리 압축한 파일 vs 원본, 304 재검증 (WSGI/ASGI 래퍼 직접 호출)"""
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+from ..staticassets import StaticFilesASGI, StaticFilesWSGI, StaticIndex, compress_file
+from . import measure, summarize
+
+PREFIX = '/static/'
+
+
+def add_arguments(parser):
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=64 * 1024, help='파일 하나의 크기 (바이트)')
+    parser.add_argument('--requests', type=int, default=2000)
+
+
+def _fallback(environ, start_response):
+    start_response('404 Not Found', [])
+    return []
+
+
+async def _afallback(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 404, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+def _make_root(directory, files, size, compress):
+    # 압축이 잘 되는 JS 비슷한 내용
+    line = b'function habit(a, b) { return a + b; } // stacker\n'
+    content = (line * (size // len(line) + 1))[:size]
+    for i in range(files):
+        path = os.path.join(directory, 'js', f'{i // 100}', f'app{i}.js')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        if compress:
+            compress_file(path)
+
+
+def _wsgi_samples(app, paths, requests, extra):
+    samples = []
+    for i in range(requests):
+        environ = {'PATH_INFO': paths[i % len(paths)], 'REQUEST_METHOD': 'GET', **extra}
+        start = time.perf_counter()
+        body = app(environ, lambda status, headers: None)
+        for _ in body:
+            pass
+        if hasattr(body, 'close'):
+            body.close()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def _asgi_samples(app, paths, requests, extra):
+    headers = [(name.encode('latin-1'), value.encode('latin-1')) for name, value in extra.items()]
+
+    async def receive():
+        return {'type': 'http.request'}
+
+    async def send(message):
+        pass
+
+    samples = []
+    for i in range(requests):
+        scope = {'type': 'http', 'method': 'GET', 'path': paths[i % len(paths)], 'headers': headers}
+        start = time.perf_counter()
+        await app(scope, receive, send)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run(options):
+    results = []
+    for compress in (False, True):
+        directory = tempfile.mkdtemp(prefix='habit-static-')
+        try:
+            _make_root(directory, options['files'], options['size'], compress)
+            start = time.perf_counter()
+            index = StaticIndex(directory, PREFIX)
+            results.append({
+                'step': 'index_scan', 'precompressed': compress, 'entries': len(index),
+                'elapsed_ms': round((time.perf_counter() - start) * 1000, 3),
+            })
+
+            paths = sorted(index.entries)
+            etag = index.lookup(paths[0]).etag
+            results.append({
+                'step': 'lookup', 'precompressed': compress,
+                **measure(lambda: [index.lookup(path) for path in paths], repeat=10),
+            })
+
+            wsgi = StaticFilesWSGI(_fallback, index)
+            asgi = StaticFilesASGI(_afallback, index)
+            cases = {
+                'identity': {},
+                'gzip': {'accept-encoding': 'gzip, deflate, br'},
+                'revalidate_304': {'accept-encoding': 'gzip, deflate, br', 'if-none-match': etag},
+            }
+            for case, headers in cases.items():
+                # 304 는 ETag 가 같은 첫 파일로만 확인
+                case_paths = paths[:1] if case == 'revalidate_304' else paths
+                environ = {f"HTTP_{name.upper().replace('-', '_')}": value for name, value in headers.items()}
+                results.append({
+                    'step': 'serve', 'server': 'wsgi', 'case': case, 'precompressed': compress,
+                    **summarize(_wsgi_samples(wsgi, case_paths, options['requests'], environ)),
+                })
+                results.append({
+                    'step': 'serve', 'server': 'asgi', 'case': case, 'precompressed': compress,
+                    **summarize(asyncio.run(_asgi_samples(asgi, case_paths, options['requests'], headers))),
+                })
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+    return results
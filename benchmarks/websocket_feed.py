@@ -0,0 +1,56 @@
+"""한 프로세스에서 웹소켓 여러 개가 한 챌린지를 구독할 때 참여 폭주의 전달 지연과 메시지 수 측정"""
+import asyncio
+import time
+
+from channels.testing import WebsocketCommunicator
+from channels.routing import URLRouter
+from django.contrib.auth.models import User
+
+from ..events import apublish
+from ..routing import websocket_urlpatterns
+from . import summarize
+
+
+def add_arguments(parser):
+    parser.add_argument('--sockets', type=int, default=500)
+    parser.add_argument('--joins', type=int, default=1000)
+
+
+async def _run(options):
+    application = URLRouter(websocket_urlpatterns)
+    sockets = [WebsocketCommunicator(application, '/ws/challenges/1/') for _ in range(options['sockets'])]
+    # 피드는 로그인한 사용자만 구독 가능 (AuthMiddlewareStack 대신 scope 에 직접 넣음)
+    user = User(pk=1, username='bench')
+    for communicator in sockets:
+        communicator.scope['user'] = user
+        connected, _ = await communicator.connect()
+        assert connected
+
+    start = time.perf_counter()
+    for _ in range(options['joins']):
+        await apublish(1, 'joins')
+
+    # 모든 참여가 전달될 때까지 소켓마다 받은 메시지 수와 마지막 도착 시간을 기록
+    async def drain(communicator):
+        received = messages = 0
+        while received < options['joins']:
+            event = await communicator.receive_json_from(timeout=10)
+            received += event['joins']
+            messages += 1
+        return messages, (time.perf_counter() - start) * 1000
+
+    drained = await asyncio.gather(*(drain(communicator) for communicator in sockets))
+    for communicator in sockets:
+        await communicator.disconnect()
+
+    messages = [count for count, _ in drained]
+    return {
+        'sockets': options['sockets'], 'joins': options['joins'],
+        'messages_per_socket_max': max(messages),
+        'messages_per_socket_mean': round(sum(messages) / len(messages), 2),
+        **{f'fanout_{key}': value for key, value in summarize([latency for _, latency in drained]).items()},
+    }
+
+
+def run(options):
+    return [asyncio.run(_run(options))]
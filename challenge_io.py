@@ -0,0 +1,103 @@
+import csv
+import json
+from pathlib import Path
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .forms import ChallengeForm
+from .fragments import bump_list_version
+from .models import Challenge
+
+FORMATS = ('csv', 'jsonl')
+EXPORT_FIELDS = [
+    'id', 'title', 'description', 'category', 'duration', 'duration_days',
+    'starts_at', 'ends_at', 'participant_count', 'verified_count',
+]
+
+
+def guess_format(path, default='csv'):
+    suffix = Path(path).suffix.lstrip('.').lower()
+    return suffix if suffix in FORMATS else default
+
+
+def read_rows(stream, fmt):
+    """(줄 번호, 행 dict, 오류) 를 하나씩 돌려줌 - 파일 전체를 메모리에 올리지 않음"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f'JSON 형식 오류: {e}'
+            continue
+        if not isinstance(row, dict):
+            yield line_no, None, 'JSON 객체가 아닙니다.'
+            continue
+        yield line_no, row, None
+
+
+def _form_errors(form):
+    return '; '.join(f'{field}: {" ".join(messages)}' for field, messages in form.errors.items())
+
+
+# 한 행씩 ChallengeForm 으로 검사하고 batch_size 개씩 bulk_create
+# 잘못된 행은 on_error(줄 번호, 메시지) 로 알려주고 건너뜀 (전체 작업은 멈추지 않음)
+def import_challenges(stream, fmt, batch_size=1000, on_error=None):
+    created = failed = 0
+    batch = []
+
+    def flush():
+        nonlocal created
+        with transaction.atomic():
+            Challenge.objects.bulk_create(batch, batch_size=batch_size)
+        created += len(batch)
+        batch.clear()
+
+    for line_no, row, error in read_rows(stream, fmt):
+        if error is None:
+            form = ChallengeForm(data=row)
+            if form.is_valid():
+                challenge = form.save(commit=False)
+                challenge.sync_schedule()
+                batch.append(challenge)
+                if len(batch) >= batch_size:
+                    flush()
+                continue
+            error = _form_errors(form)
+        failed += 1
+        if on_error is not None:
+            on_error(line_no, error)
+
+    if batch:
+        flush()
+    if created:
+        bump_list_version()
+    return created, failed
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def export_lines(queryset=None, fmt='csv', chunk_size=2000):
+    """목록과 같은 순서(최신순)로 한 줄씩 만들어 돌려줌 - iterator(chunk_size) 로 메모리 사용량이 일정함"""
+    if queryset is None:
+        queryset = Challenge.objects.all()
+    rows = queryset.order_by('-pk').values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            yield writer.writerow(row)
+        return
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
@@ -0,0 +1,97 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import events
+from .models import ChallengeParticipant
+from .participation import set_verified
+
+MAX_DAYS = 28
+
+
+# 비트 연산 헬퍼: bits 의 i번 비트 = 참여 i일째 체크인 여부
+def full_mask(days):
+    return (1 << days) - 1
+
+
+def checked_days(bits, days=MAX_DAYS):
+    return (bits & full_mask(days)).bit_count()
+
+
+def completion(bits, days):
+    return checked_days(bits, days) / days
+
+
+def is_complete(bits, days):
+    return bits & full_mask(days) == full_mask(days)
+
+
+def current_streak(bits, today):
+    # 오늘 아직 체크인하지 않았다면 어제까지의 연속 일수를 셈
+    if not bits >> today & 1:
+        today -= 1
+    if today < 0:
+        return 0
+    # today 이하에서 가장 높은 0비트 위치를 찾으면 그 위부터 today 까지가 연속 구간
+    missing = ~bits & full_mask(today + 1)
+    return today + 1 - missing.bit_length()
+
+
+def longest_streak(bits):
+    streak = 0
+    while bits:
+        bits &= bits << 1
+        streak += 1
+    return streak
+
+
+# 0일째 = 참여한 날, 챌린지가 아직 시작 전에 참여했다면 시작한 날
+def day_index(participant, when=None, challenge=None):
+    challenge = challenge or participant.challenge
+    today = timezone.localdate(when or timezone.now())
+    return (today - timezone.localdate(max(participant.join_data, challenge.starts_at))).days
+
+
+# 체크인은 챌린지 기간(starts_at ~ ends_at) 안에서만 받음
+def in_window(challenge, when=None):
+    now = when or timezone.now()
+    return challenge.starts_at <= now < challenge.ends_at
+
+
+def progress(participant, when=None):
+    days = participant.challenge.duration_days
+    today = day_index(participant, when)
+    bits = participant.checkin_bits
+    active = 0 <= today < days and in_window(participant.challenge, when)
+    return {
+        'day': min(today, days - 1) + 1,
+        'active': active,
+        'checked_today': active and bool(bits >> today & 1),
+        'checked_days': checked_days(bits, days),
+        'completion': completion(bits, days),
+        'current_streak': current_streak(bits, min(today, days - 1)) if today >= 0 else 0,
+        'longest_streak': longest_streak(bits & full_mask(days)),
+    }
+
+
+def check_in(participant, when=None):
+    days = participant.challenge.duration_days
+    day = day_index(participant, when)
+    if not 0 <= day < days or not in_window(participant.challenge, when):
+        raise ValidationError('챌린지 기간이 아닙니다.')
+
+    # 참여 기록과 체크인은 같은 DB(샤드)에 있음
+    db = participant._state.db
+    with transaction.atomic(), transaction.atomic(using=db):
+        _, created = participant.checkins.get_or_create(day=day)
+        if created:
+            ChallengeParticipant.objects.using(db).filter(pk=participant.pk).update(
+                checkin_bits=F('checkin_bits').bitor(1 << day),
+            )
+            participant.refresh_from_db(fields=['checkin_bits'])
+            transaction.on_commit(lambda: events.publish(participant.challenge_id, 'check_ins'))
+            # 기간 내 모든 날을 체크인하면 인증 완료
+            if is_complete(participant.checkin_bits, days) and not participant.is_verified:
+                set_verified(participant)
+    return created
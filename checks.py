@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# 'shared' 캐시가 프로세스마다 따로인 LocMemCache 면 워커/작업 워커끼리 캐시 무효화가 전달되지 않음
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get('shared', {}).get('BACKEND', '')
+    if backend.endswith('LocMemCache'):
+        return [Warning(
+            "'shared' 캐시가 LocMemCache 입니다. 워커가 여러 개면 HABIT_REDIS_URL 로 Redis 를 지정하세요.",
+            id='habit_stacker.W001',
+        )]
+    return []
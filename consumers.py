@@ -0,0 +1,26 @@
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .events import group_name
+
+
+# 챌린지 하나의 참여/체크인 소식을 받는 웹소켓 (ws/challenges/<pk>/)
+# 로그인한 사용자만 구독할 수 있고, 보내는 내용은 숫자뿐 (누가 참여했는지는 보내지 않음)
+class ChallengeFeedConsumer(AsyncJsonWebsocketConsumer):
+    async def connect(self):
+        self.group = group_name(self.scope['url_route']['kwargs']['pk'])
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close()
+            return
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    async def challenge_batch(self, event):
+        await self.send_json({
+            'challenge': event['challenge'],
+            'joins': event['joins'],
+            'check_ins': event['check_ins'],
+        })
@@ -0,0 +1,84 @@
+import asyncio
+import weakref
+
+from asgiref.sync import SyncToAsync, async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+# 챌린지별 실시간 이벤트(참여, 체크인)를 모아서 보내는 곳
+# 짧은 시간(HABIT_EVENT_FLUSH_INTERVAL) 동안 들어온 이벤트를 합쳐서 그룹에 한 번만 보냄
+# -> 참여가 1000번 몰려도 소켓에는 메시지 몇 개만 감
+# 채널 레이어는 이벤트 루프에 묶여 있으므로 모아두는 버퍼도 루프마다 따로 둠
+# 구독자에게는 개수만 보냄 (사용자 id 는 싣지 않음)
+
+
+def group_name(challenge_id):
+    return f'challenge_{challenge_id}'
+
+
+class EventBatcher:
+    def __init__(self, interval):
+        self.interval = interval
+        self.pending = {}
+        self.handle = None
+
+    def record(self, challenge_id, kind, count=1):
+        batch = self.pending.setdefault(challenge_id, {'joins': 0, 'check_ins': 0})
+        batch[kind] += count
+
+    async def add(self, challenge_id, kind, count=1):
+        self.record(challenge_id, kind, count)
+        if self.handle is None:
+            loop = asyncio.get_running_loop()
+            self.handle = loop.call_later(self.interval, lambda: loop.create_task(self.flush()))
+
+    async def flush(self):
+        self.handle = None
+        pending, self.pending = self.pending, {}
+        layer = get_channel_layer()
+        if layer is None:
+            return
+        for challenge_id, batch in pending.items():
+            await layer.group_send(group_name(challenge_id), {
+                'type': 'challenge.batch',
+                'challenge': challenge_id,
+                **batch,
+            })
+
+
+_batchers = weakref.WeakKeyDictionary()
+
+
+def get_batcher():
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None:
+        batcher = _batchers[loop] = EventBatcher(getattr(settings, 'HABIT_EVENT_FLUSH_INTERVAL', 0.25))
+    return batcher
+
+
+async def apublish(challenge_id, kind, count=1):
+    await get_batcher().add(challenge_id, kind, count)
+
+
+# 모으지 않고 바로 보냄 (오래 살아 있는 이벤트 루프가 없을 때)
+async def asend_now(challenge_id, kind, count=1):
+    batcher = EventBatcher(0)
+    batcher.record(challenge_id, kind, count)
+    await batcher.flush()
+
+
+def _server_loop():
+    # ASGI 서버가 sync_to_async 로 동기 뷰를 돌리는 스레드에는 서버의 이벤트 루프가 기록돼 있음
+    loop = getattr(SyncToAsync.threadlocal, 'main_event_loop', None)
+    return loop if loop is not None and loop.is_running() else None
+
+
+# 동기 뷰에서 호출
+# ASGI 에서는 async_to_sync 가 서버의 이벤트 루프에서 실행해줘서 모아 보낼 수 있지만,
+# WSGI/runserver/작업 워커에서는 호출이 끝나면 사라지는 임시 루프라 call_later 로 예약한 flush 가 실행되지 않으므로 바로 보냄
+def publish(challenge_id, kind, count=1):
+    if _server_loop() is not None:
+        async_to_sync(apublish)(challenge_id, kind, count)
+    else:
+        async_to_sync(asend_now)(challenge_id, kind, count)
@@ -0,0 +1,79 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+# 렌더링된 페이지 조각 캐시
+# 키에 버전 스탬프가 들어가서, 챌린지가 바뀌면 버전만 올리고 예전 조각은 LRU로 밀려나게 둠
+# 버전 스탬프는 time_ns 값이라 나중에 Last-Modified 로도 쓸 수 있음
+# 조각은 프로세스마다 LocMem 에 두지만, 버전 스탬프는 작업 워커나 다른 워커에서 올린 것도 보여야 하므로 'shared' 캐시에 둠
+
+
+def fragment_cache():
+    return caches['fragments']
+
+
+def _versions():
+    return caches['shared']
+
+
+def _version_key(name):
+    return f'fragments:version:{name}'
+
+
+def get_version(name):
+    key = _version_key(name)
+    version = _versions().get(key)
+    if version is None:
+        _versions().add(key, time.time_ns(), None)
+        version = _versions().get(key)
+    return version
+
+
+def challenge_version(pk):
+    return get_version(f'challenge:{pk}')
+
+
+def list_version():
+    return get_version('list')
+
+
+def bump_list_version():
+    _versions().set(_version_key('list'), time.time_ns(), None)
+
+
+def bump_challenge_version(pk):
+    now = time.time_ns()
+    _versions().set_many({_version_key(f'challenge:{pk}'): now, _version_key('list'): now}, None)
+
+
+# 세션/메시지 쿠키가 없는 익명 GET 요청만 캐시함 -> request.user 를 건드리지 않아 DB 조회가 없음
+def is_cacheable(request):
+    if not getattr(settings, 'HABIT_FRAGMENT_CACHE', False):
+        return False
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES and 'messages' not in request.COOKIES
+
+
+def list_page_key(request):
+    return f'fragments:list:{list_version()}:{request.GET.urlencode()}'
+
+
+def challenge_page_key(pk):
+    return f'fragments:challenge:{pk}:{challenge_version(pk)}'
+
+
+def cached_response(key):
+    content = fragment_cache().get(key)
+    if content is None:
+        return None
+    return HttpResponse(content)
+
+
+def store_response(request, key, response):
+    # csrf 토큰이 들어간 페이지는 요청마다 달라서 캐시하지 않음
+    if response.status_code == 200 and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+        fragment_cache().set(key, response.content)
+    return response
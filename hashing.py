@@ -0,0 +1,113 @@
+import asyncio
+import binascii
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+from django.conf import settings
+from django.contrib.auth.hashers import BCryptSHA256PasswordHasher
+
+# bcrypt 는 한 번에 100~300ms 씩 CPU를 쓰므로 ASGI 이벤트 루프 밖(프로세스 풀)에서 돌림
+# HABIT_BCRYPT_ROUNDS: 작업 비용(cost), HABIT_BCRYPT_POOL_SIZE: 풀 크기 (0 이면 풀 없이 바로 계산)
+# 실제 로그인(authenticate, UserCreationForm)은 장고 auth User 를 쓰므로 PASSWORD_HASHERS 의
+# PooledBCryptSHA256PasswordHasher 를 통해 같은 풀을 사용함
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def bcrypt_rounds():
+    return getattr(settings, 'HABIT_BCRYPT_ROUNDS', 12)
+
+
+def _hashpw(raw_password, rounds):
+    return bcrypt.hashpw(raw_password.encode(), bcrypt.gensalt(rounds)).decode()
+
+
+def _checkpw(raw_password, hashed):
+    return bcrypt.checkpw(raw_password.encode(), hashed.encode())
+
+
+def _hashpw_bytes(password, salt):
+    return bcrypt.hashpw(password, salt)
+
+
+def hash_password(raw_password):
+    return _hashpw(raw_password, bcrypt_rounds())
+
+
+def check_password(raw_password, hashed):
+    return _checkpw(raw_password, hashed)
+
+
+# 저장된 해시의 cost 가 설정값과 다르면 로그인할 때 다시 해시해야 함 ($2b$12$... 형식)
+def needs_rehash(hashed):
+    try:
+        return int(hashed.split('$')[2]) != bcrypt_rounds()
+    except (IndexError, ValueError):
+        return True
+
+
+def get_executor():
+    global _executor
+    size = getattr(settings, 'HABIT_BCRYPT_POOL_SIZE', None)
+    if size == 0:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # 스레드가 여러 개인 서버 프로세스를 fork 하면 다른 스레드가 잡고 있던 잠금 때문에 자식이 멈출 수 있으므로
+                # forkserver 로 깨끗한 프로세스에서 띄움 (이 모듈은 django.setup() 없이도 불러올 수 있음)
+                _executor = ProcessPoolExecutor(
+                    max_workers=size or os.cpu_count(), mp_context=multiprocessing.get_context('forkserver'),
+                )
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+
+async def _run(fn, *args):
+    executor = get_executor()
+    if executor is None:
+        return fn(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
+async def ahash_password(raw_password):
+    return await _run(_hashpw, raw_password, bcrypt_rounds())
+
+
+async def acheck_password(raw_password, hashed):
+    return await _run(_checkpw, raw_password, hashed)
+
+
+# 동기 경로(authenticate, check_password)에서는 풀에 맡기고 결과를 기다림
+# 스레드는 기다리는 동안 CPU를 쓰지 않고, 동시에 계산되는 해시 수는 풀 크기로 제한됨
+def _call(fn, *args):
+    executor = get_executor()
+    if executor is None:
+        return fn(*args)
+    return executor.submit(fn, *args).result()
+
+
+# 장고 bcrypt_sha256 과 같은 형식이라 기존 해시도 그대로 확인됨, cost 는 HABIT_BCRYPT_ROUNDS 를 따름
+class PooledBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    @property
+    def rounds(self):
+        return bcrypt_rounds()
+
+    def salt(self):
+        return bcrypt.gensalt(self.rounds)
+
+    def encode(self, password, salt):
+        password = binascii.hexlify(self.digest(password.encode()).digest())
+        data = _call(_hashpw_bytes, password, salt)
+        return f'{self.algorithm}${data.decode("ascii")}'
@@ -0,0 +1,157 @@
+import logging
+import random
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.models import F, Subquery
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# DB 기반 작업 큐
+# - enqueue 는 호출한 쪽 트랜잭션 안에서 INSERT 되므로, 롤백되면 작업도 같이 사라짐
+# - 워커는 claim() 으로 여러 개를 한 번에 가져감
+#   PostgreSQL 등은 SELECT ... FOR UPDATE SKIP LOCKED, SQLite 는 쓰기가 직렬화되므로 UPDATE ... WHERE id IN (SELECT ... LIMIT n) 한 문장으로 가져감
+# - 실패하면 지수 백오프(+지터)로 run_at 을 미뤄서 다시 시도하고, max_attempts 를 넘으면 failed 로 남김
+# - 실행하는 동안에는 heartbeat 가 locked_at 을 갱신하므로, LOCK_TIMEOUT 보다 오래 걸리는 작업도 멈춘 작업으로 보지 않음
+
+_handlers = {}
+
+
+def register(name):
+    def decorator(fn):
+        _handlers[name] = fn
+        return fn
+    return decorator
+
+
+def enqueue(name, payload=None, run_at=None, unique_key=None, max_attempts=None):
+    job = Job(name=name, payload=payload or {}, unique_key=unique_key)
+    if run_at is not None:
+        job.run_at = run_at
+    if max_attempts is not None:
+        job.max_attempts = max_attempts
+    if unique_key is None:
+        job.save()
+        return job
+    # 같은 키의 작업이 이미 있으면 그것을 돌려줌
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        job = Job.objects.get(unique_key=unique_key)
+    return job
+
+
+def _ready(now):
+    return Job.objects.filter(status=Job.QUEUED, run_at__lte=now).order_by('run_at', 'pk')
+
+
+def claim(worker_id, batch_size=10):
+    now = timezone.now()
+    claimed = {
+        'status': Job.RUNNING, 'locked_by': worker_id, 'locked_at': now, 'attempts': F('attempts') + 1,
+    }
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            ids = list(_ready(now).select_for_update(skip_locked=True).values_list('pk', flat=True)[:batch_size])
+            Job.objects.filter(pk__in=ids).update(**claimed)
+        else:
+            # status=queued 조건을 바깥 UPDATE 에도 걸어서, 다른 워커가 먼저 가져간 행은 건너뜀
+            Job.objects.filter(
+                pk__in=Subquery(_ready(now).values('pk')[:batch_size]), status=Job.QUEUED,
+            ).update(**claimed)
+        return list(Job.objects.filter(status=Job.RUNNING, locked_by=worker_id, locked_at=now).order_by('run_at', 'pk'))
+
+
+# 워커가 죽어서 running 으로 남은 작업을 다시 대기열로 돌림 (heartbeat 가 멈춘 지 timeout 이 지난 작업)
+def requeue_stale(timeout=None):
+    timeout = timeout or getattr(settings, 'HABIT_JOB_LOCK_TIMEOUT', 15 * 60)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff).update(
+        status=Job.QUEUED, locked_by='', locked_at=None,
+    )
+
+
+def backoff(attempts):
+    base = getattr(settings, 'HABIT_JOB_RETRY_BASE', 10)
+    cap = getattr(settings, 'HABIT_JOB_RETRY_MAX', 60 * 60)
+    delay = min(cap, base * 2 ** (attempts - 1))
+    return timedelta(seconds=delay * random.uniform(0.5, 1))
+
+
+# 작업을 실행하는 동안 별도 스레드에서 interval 초마다 locked_at 을 갱신함
+@contextmanager
+def heartbeat(job, interval=None):
+    interval = interval or getattr(settings, 'HABIT_JOB_HEARTBEAT', 60)
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                try:
+                    Job.objects.filter(pk=job.pk, locked_by=job.locked_by, status=Job.RUNNING).update(
+                        locked_at=timezone.now(),
+                    )
+                except DatabaseError:
+                    logger.warning('heartbeat for job %s failed', job, exc_info=True)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f'job-heartbeat-{job.pk}', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_job(job):
+    handler = _handlers.get(job.name)
+    try:
+        if handler is None:
+            raise LookupError(f'등록되지 않은 작업입니다: {job.name}')
+        with heartbeat(job):
+            handler(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning('job %s failed (attempt %d/%d)\n%s', job, job.attempts, job.max_attempts, error)
+        if job.attempts >= job.max_attempts:
+            fields = {'status': Job.FAILED, 'finished_at': timezone.now()}
+        else:
+            fields = {'status': Job.QUEUED, 'run_at': timezone.now() + backoff(job.attempts)}
+        Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+            locked_by='', locked_at=None, last_error=error, **fields,
+        )
+        return False
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+        status=Job.DONE, locked_by='', locked_at=None, finished_at=timezone.now(),
+    )
+    return True
+
+
+# settings.HABIT_PERIODIC_JOBS = {작업 이름: 간격(초)}
+# 구간마다 unique_key 가 같으므로 워커가 여러 개여도 한 번만 들어감
+def schedule_periodic(now=None):
+    now = now or timezone.now()
+    jobs = []
+    for name, interval in getattr(settings, 'HABIT_PERIODIC_JOBS', {}).items():
+        bucket = int(now.timestamp() // interval)
+        jobs.append(enqueue(name, unique_key=f'periodic:{name}:{bucket}'))
+    return jobs
+
+
+# 끝난 작업 정리 (실패한 작업은 확인할 수 있게 남겨둠)
+def purge_finished(days=None):
+    if days is None:
+        days = getattr(settings, 'HABIT_JOB_RETENTION_DAYS', 7)
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = Job.objects.filter(status=Job.DONE, finished_at__lt=cutoff).delete()
+    return deleted
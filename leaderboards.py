@@ -0,0 +1,268 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .archive import unpack
+from .models import (
+    Challenge, ChallengeActivity, ChallengeParticipant, ChallengeStats, ParticipationArchive, UserCategoryScore,
+    Watermark,
+)
+from .routers import each_shard, shards
+
+# 리더보드 집계
+# 참여/인증 기록을 시간 단위 버킷(ChallengeActivity)과 사용자 점수(UserCategoryScore)에 더해두고,
+# 순위용 값(ChallengeStats)은 바뀐 챌린지만 다시 계산함 -> 읽을 때는 인덱스 순서대로 한 페이지만 읽음
+# 참여 기록이 샤드에 나뉘어 있으면 샤드마다 따로 읽음 (참여 id 는 샤드마다 따로 매겨지므로 워터마크도 샤드별)
+
+JOINS_WATERMARK = 'leaderboard_joins'
+VERIFIED_WATERMARK = 'leaderboard_verified'
+TRENDING_WINDOW = timedelta(hours=24)
+# 늦게 커밋되는 인증을 놓치지 않도록 최근 1분은 다음 실행에서 처리
+SETTLE_DELAY = timedelta(minutes=1)
+MAX_PAGE_SIZE = 100
+
+
+def _increment(model, lookup, field, amount):
+    if model.objects.filter(**lookup).update(**{field: F(field) + amount}):
+        return
+    _, created = model.objects.get_or_create(**lookup, defaults={field: amount})
+    if not created:
+        model.objects.filter(**lookup).update(**{field: F(field) + amount})
+
+
+def _to_micros(value):
+    return int(value.timestamp() * 1_000_000)
+
+
+def _from_micros(value):
+    return datetime.fromtimestamp(value / 1_000_000, tz=dt_timezone.utc)
+
+
+def _watermark_name(name, db):
+    return name if db == 'default' else f'{name}:{db}'
+
+
+# id 는 커밋 전에 매겨지므로(PostgreSQL 등) 최근 SETTLE_DELAY 안에 들어온 참여부터는 다음 실행으로 미룸
+# -> 아직 커밋되지 않은 더 작은 id 를 워터마크가 건너뛰지 않음
+def _aggregate_joins(watermark, until, db='default'):
+    participants = ChallengeParticipant.objects.using(db)
+    unsettled = participants.filter(pk__gt=watermark.position, join_data__gt=until).aggregate(min_id=Min('pk'))['min_id']
+    if unsettled is not None:
+        max_id = unsettled - 1
+    else:
+        max_id = participants.aggregate(max_id=Max('pk'))['max_id'] or 0
+    max_id = max(max_id, watermark.position)
+    groups = (
+        participants.filter(pk__gt=watermark.position, pk__lte=max_id)
+        .annotate(hour=TruncHour('join_data'))
+        .values('challenge_id', 'hour')
+        .annotate(n=Count('pk'))
+        .order_by()
+    )
+    touched = set()
+    for group in groups.iterator():
+        _increment(ChallengeActivity, {'challenge_id': group['challenge_id'], 'hour': group['hour']}, 'joins', group['n'])
+        touched.add(group['challenge_id'])
+    watermark.position = max_id
+    return touched
+
+
+# (user_id, 카테고리, 인증 수) - 샤드에는 챌린지 테이블이 없어서 JOIN 대신 챌린지 id 로 카테고리를 찾음
+def _verified_by_category(verified, db, chunk_size=10_000):
+    if db not in shards():
+        for group in verified.values('user_id', 'challenge__category').annotate(n=Count('pk')).order_by().iterator():
+            yield group['user_id'], group['challenge__category'], group['n']
+        return
+    rows = list(verified.values_list('user_id', 'challenge_id').order_by().iterator(chunk_size=chunk_size))
+    challenge_ids = sorted({challenge_id for _, challenge_id in rows})
+    category_of = {}
+    for start in range(0, len(challenge_ids), chunk_size):
+        category_of.update(
+            Challenge.objects.filter(pk__in=challenge_ids[start:start + chunk_size]).values_list('pk', 'category')
+        )
+    counts = {}
+    for user_id, challenge_id in rows:
+        key = (user_id, category_of.get(challenge_id, ''))
+        counts[key] = counts.get(key, 0) + 1
+    for (user_id, category), n in counts.items():
+        yield user_id, category, n
+
+
+def _aggregate_verifications(watermark, until):
+    touched = set()
+    totals = {}
+    for db in each_shard():
+        verified = ChallengeParticipant.objects.using(db).filter(
+            verified_at__gt=_from_micros(watermark.position), verified_at__lte=until,
+        )
+        by_hour = (
+            verified.annotate(hour=TruncHour('verified_at'))
+            .values('challenge_id', 'hour')
+            .annotate(n=Count('pk'))
+            .order_by()
+        )
+        for group in by_hour.iterator():
+            _increment(
+                ChallengeActivity, {'challenge_id': group['challenge_id'], 'hour': group['hour']}, 'verifications', group['n'],
+            )
+            touched.add(group['challenge_id'])
+
+        for user_id, category, n in _verified_by_category(verified, db):
+            _increment(UserCategoryScore, {'user_id': user_id, 'category': category}, 'verified', n)
+            totals[user_id] = totals.get(user_id, 0) + n
+    for user_id, n in totals.items():
+        _increment(UserCategoryScore, {'user_id': user_id, 'category': ''}, 'verified', n)
+
+    watermark.position = _to_micros(until)
+    return touched
+
+
+def _hour(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+# 전체 다시 계산할 때 보관 테이블(archive.py)로 옮겨진 참여 기록도 버킷과 사용자 점수에 다시 넣음
+# 비운 테이블에 먼저 채우므로 bulk_create 로 넣고, 이어지는 참여 테이블 집계는 _increment 로 더함
+def _aggregate_archived(batch_size=1000):
+    activity = {}
+    scores = {}
+    for db in each_shard():
+        for archive in ParticipationArchive.objects.using(db).order_by().iterator(chunk_size=batch_size):
+            for record in unpack(archive):
+                key = (record.challenge_id, _hour(record.join_data))
+                activity.setdefault(key, [0, 0])[0] += 1
+                if record.verified_at is not None:
+                    key = (record.challenge_id, _hour(record.verified_at))
+                    activity.setdefault(key, [0, 0])[1] += 1
+                    key = (record.user_id, record.challenge_id)
+                    scores[key] = scores.get(key, 0) + 1
+
+    challenge_ids = sorted({challenge_id for challenge_id, _ in activity})
+    category_of = {}
+    for start in range(0, len(challenge_ids), 10_000):
+        category_of.update(
+            Challenge.objects.filter(pk__in=challenge_ids[start:start + 10_000]).values_list('pk', 'category')
+        )
+    ChallengeActivity.objects.bulk_create(
+        [
+            ChallengeActivity(challenge_id=challenge_id, hour=hour, joins=joins, verifications=verifications)
+            for (challenge_id, hour), (joins, verifications) in activity.items()
+            if challenge_id in category_of
+        ],
+        batch_size=batch_size,
+    )
+    totals = {}
+    for (user_id, challenge_id), n in scores.items():
+        if challenge_id not in category_of:
+            continue
+        for category in (category_of[challenge_id], ''):
+            totals[user_id, category] = totals.get((user_id, category), 0) + n
+    UserCategoryScore.objects.bulk_create(
+        [UserCategoryScore(user_id=user_id, category=category, verified=n) for (user_id, category), n in totals.items()],
+        batch_size=batch_size,
+    )
+
+
+def refresh_stats(challenge_ids, now=None, batch_size=1000):
+    now = now or timezone.now()
+    # 24시간 창에서 빠져나간 챌린지도 다시 계산해야 하므로 현재 순위에 있는 챌린지를 함께 포함
+    ids = set(challenge_ids)
+    ids.update(ChallengeStats.objects.filter(joins_24h__gt=0).values_list('challenge_id', flat=True))
+    ids = sorted(ids)
+
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        recent = dict(
+            ChallengeActivity.objects.filter(challenge_id__in=chunk, hour__gte=now - TRENDING_WINDOW)
+            .values('challenge_id').annotate(n=Sum('joins')).values_list('challenge_id', 'n')
+        )
+        rows = [
+            ChallengeStats(
+                challenge=challenge,
+                category=challenge.category,
+                participants=challenge.participant_count,
+                verified=challenge.verified_count,
+                completion_rate=challenge.verified_count / challenge.participant_count if challenge.participant_count else 0,
+                joins_24h=recent.get(challenge.pk, 0),
+            )
+            for challenge in Challenge.objects.filter(pk__in=chunk).only(
+                'pk', 'category', 'participant_count', 'verified_count',
+            )
+        ]
+        ChallengeStats.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['challenge'],
+            update_fields=['category', 'participants', 'verified', 'completion_rate', 'joins_24h', 'updated_at'],
+        )
+    return len(ids)
+
+
+# 증분 집계는 더하기만 하므로 탈퇴/인증 취소는 반영되지 않음 -> 주기 작업 rebuild_leaderboards 가 full=True 로 다시 맞춤
+def refresh(full=False):
+    """새 참여/인증 기록을 집계 테이블에 반영하고 다시 계산한 챌린지 수를 반환"""
+    now = timezone.now()
+    with transaction.atomic():
+        joins = {
+            db: Watermark.objects.select_for_update().get_or_create(name=_watermark_name(JOINS_WATERMARK, db))[0]
+            for db in each_shard()
+        }
+        verified, _ = Watermark.objects.select_for_update().get_or_create(name=VERIFIED_WATERMARK)
+        if full:
+            ChallengeActivity.objects.all().delete()
+            UserCategoryScore.objects.all().delete()
+            for watermark in joins.values():
+                watermark.position = 0
+            verified.position = 0
+            _aggregate_archived()
+
+        touched = set()
+        for db, watermark in joins.items():
+            touched |= _aggregate_joins(watermark, now - SETTLE_DELAY, db)
+        touched |= _aggregate_verifications(verified, now - SETTLE_DELAY)
+        for watermark in [*joins.values(), verified]:
+            watermark.save(update_fields=['position', 'updated_at'])
+
+    if full:
+        touched = Challenge.objects.values_list('pk', flat=True).iterator(chunk_size=10_000)
+    return refresh_stats(touched, now)
+
+
+def _page(queryset, limit, offset):
+    limit = min(limit, MAX_PAGE_SIZE)
+    return list(queryset[offset:offset + limit])
+
+
+# 리더보드 페이지가 읽는 쿼리 (explain_queries 도 같은 쿼리셋으로 실행 계획을 봄)
+def trending_queryset(category=None):
+    queryset = ChallengeStats.objects.filter(joins_24h__gt=0)
+    if category:
+        queryset = queryset.filter(category=category)
+    return queryset.select_related('challenge').order_by('-joins_24h')
+
+
+def completion_queryset(category=None):
+    queryset = ChallengeStats.objects.filter(participants__gt=0)
+    if category:
+        queryset = queryset.filter(category=category)
+    return queryset.select_related('challenge').order_by('-completion_rate', '-participants')
+
+
+def top_users_queryset(category=''):
+    queryset = UserCategoryScore.objects.filter(category=category or '', verified__gt=0)
+    return queryset.select_related('user').order_by('-verified')
+
+
+def trending_challenges(category=None, limit=20, offset=0):
+    return _page(trending_queryset(category), limit, offset)
+
+
+def completion_leaders(category=None, limit=20, offset=0):
+    return _page(completion_queryset(category), limit, offset)
+
+
+def top_users(category='', limit=20, offset=0):
+    return _page(top_users_queryset(category), limit, offset)
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ... import archive
+
+
+class Command(BaseCommand):
+    help = '끝난 챌린지의 참여 기록을 보관 테이블로 옮깁니다. 중간에 멈춰도 다시 실행하면 이어서 처리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--after-days', type=int, default=None, help='끝난 지 며칠이 지난 챌린지부터 보관 (기본 HABIT_ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='한 트랜잭션에서 옮길 참여 행 수')
+        parser.add_argument('--challenge-batch', type=int, default=500)
+
+    def handle(self, *args, **options):
+        cutoff = None
+        if options['after_days'] is not None:
+            cutoff = timezone.now() - timedelta(days=options['after_days'])
+        result = archive.archive_finished(
+            batch_size=options['batch_size'], challenge_batch=options['challenge_batch'], cutoff=cutoff,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['challenges']}개 챌린지, {result['participations']}개 참여 기록을 보관했습니다."
+        ))
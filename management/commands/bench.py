@@ -0,0 +1,27 @@
+import importlib
+import json
+
+from django.core.management.base import BaseCommand
+
+from ... import benchmarks
+
+
+class Command(BaseCommand):
+    help = '임시 DB에서 성능 벤치마크를 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+        subparsers = parser.add_subparsers(dest='benchmark', required=True)
+        for name in benchmarks.BENCHMARKS:
+            module = importlib.import_module(f'{benchmarks.__name__}.{name}')
+            module.add_arguments(subparsers.add_parser(name, help=module.__doc__))
+
+    def handle(self, *args, **options):
+        module = importlib.import_module(f"{benchmarks.__name__}.{options['benchmark']}")
+        results = module.run(options)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for row in results:
+            self.stdout.write('  '.join(f'{key}={value}' for key, value in row.items()))
@@ -0,0 +1,91 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+
+from ... import leaderboards
+from ...archive import _archive_columns
+from ...models import Challenge
+from ...pagination import CursorPaginator, encode_cursor
+from ...routers import participants_for
+from ...views import ChallengeList, filter_challenges
+
+
+# 목록 페이지: 뷰와 같은 filter_challenges + CursorPaginator 로 만든 쿼리셋 (?쿼리스트링, 커서)
+def _list_page(query, cursor=None):
+    paginator = CursorPaginator(filter_challenges(Challenge.objects.all(), QueryDict(query)), ChallengeList.paginate_by)
+    return paginator._seek(cursor)[0]
+
+
+# leaderboard_page 는 기본 limit 으로 한 페이지씩 읽음
+LEADERBOARD_PAGE = 20
+
+
+# 뷰별로 실제로 나가는 쿼리 (뷰가 쓰는 함수/쿼리셋을 그대로 불러서 만듦)
+# 인덱스는 여기 나오는 쿼리에 맞춰서만 추가함
+def view_queries(challenge, user_id):
+    category = f'category={challenge.category}'
+    return {
+        'main_page': [
+            ('first page', _list_page('')),
+            ('cursor page', _list_page('', encode_cursor(challenge.pk, 'n'))),
+            ('category filter', _list_page(category)),
+            ('active now', _list_page('status=active')),
+            ('ending soon', _list_page('status=ending_soon')),
+            ('active in category', _list_page(f'status=active&{category}')),
+        ],
+        'single_challenge_page': [
+            ('joined challenge ids', participants_for(user_id).values_list('challenge_id', flat=True)),
+            ('archived challenge ids', _archive_columns(user_id)),
+            ('challenge', Challenge.objects.filter(pk=challenge.pk)),
+            ('recommendations', challenge.recommendations.select_related('recommended').order_by('rank')),
+        ],
+        'joined_challenge_page': [
+            ('live challenge lock', Challenge.objects.filter(pk=challenge.pk, archive_status=Challenge.ARCHIVE_LIVE)),
+            ('get_or_create lookup', participants_for(user_id).filter(challenge=challenge)),
+        ],
+        'check_in_page': [
+            ('participant', participants_for(user_id).filter(challenge_id=challenge.pk)),
+        ],
+        'dashboard_page': [
+            ('participations', participants_for(user_id)),
+            ('archived participations', _archive_columns(user_id)),
+            ('challenges', Challenge.objects.filter(pk__in=[challenge.pk])),
+        ],
+        'leaderboard_page': [
+            ('trending', leaderboards.trending_queryset()[:LEADERBOARD_PAGE]),
+            ('trending in category', leaderboards.trending_queryset(challenge.category)[:LEADERBOARD_PAGE]),
+            ('completion', leaderboards.completion_queryset()[:LEADERBOARD_PAGE]),
+            ('completion in category', leaderboards.completion_queryset(challenge.category)[:LEADERBOARD_PAGE]),
+            ('top users', leaderboards.top_users_queryset()[:LEADERBOARD_PAGE]),
+            ('top users in category', leaderboards.top_users_queryset(challenge.category)[:LEADERBOARD_PAGE]),
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = '각 뷰가 실행하는 쿼리의 EXPLAIN 실행 계획을 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('views', nargs='*', help='출력할 뷰 이름 (기본값: 전체)')
+        parser.add_argument('--format', help='EXPLAIN 출력 형식 (PostgreSQL: text, json, ...)')
+
+    def handle(self, *args, **options):
+        challenge = Challenge.objects.order_by('-pk').first()
+        if challenge is None:
+            raise CommandError('챌린지가 하나도 없습니다. 데이터를 먼저 넣어주세요.')
+        user_id = User.objects.values_list('pk', flat=True).first() or 0
+
+        queries = view_queries(challenge, user_id)
+        unknown = set(options['views']) - set(queries)
+        if unknown:
+            raise CommandError(f"알 수 없는 뷰: {', '.join(sorted(unknown))}")
+
+        explain_options = {'format': options['format']} if options['format'] else {}
+        for view, items in queries.items():
+            if options['views'] and view not in options['views']:
+                continue
+            self.stdout.write(self.style.MIGRATE_HEADING(view))
+            for label, queryset in items:
+                self.stdout.write(f'  {label}')
+                for line in queryset.explain(**explain_options).splitlines():
+                    self.stdout.write(f'    {line}')
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from ...challenge_io import FORMATS, export_lines, guess_format
+
+
+class Command(BaseCommand):
+    help = '챌린지 목록을 CSV/JSONL 로 내보냅니다 (메모리 사용량 일정).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help="파일 경로 (기본값 '-': 표준 출력)")
+        parser.add_argument('--format', choices=FORMATS, help='기본값: 파일 확장자로 판단')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or guess_format(path)
+        lines = export_lines(fmt=fmt, chunk_size=options['chunk_size'])
+
+        if path == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.writelines(lines)
@@ -0,0 +1,29 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from ...challenge_io import FORMATS, guess_format, import_challenges
+
+
+class Command(BaseCommand):
+    help = 'CSV/JSONL 파일의 챌린지를 ChallengeForm 으로 검사해서 묶음 단위로 추가합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="파일 경로 ('-' 이면 표준 입력)")
+        parser.add_argument('--format', choices=FORMATS, help='기본값: 파일 확장자로 판단')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or guess_format(path)
+
+        def on_error(line_no, message):
+            self.stderr.write(f'{line_no}번째 줄: {message}')
+
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+        try:
+            created, failed = import_challenges(stream, fmt, options['batch_size'], on_error)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        self.stdout.write(self.style.SUCCESS(f'{created}개 추가, {failed}개 실패'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import recommendations
+
+
+class Command(BaseCommand):
+    help = '함께 참여한 챌린지 추천 테이블(챌린지별/카테고리별 상위 K개)을 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--incremental', action='store_true', help='마지막 실행 이후 바뀐 챌린지만 다시 계산')
+        parser.add_argument('--top-k', type=int, default=recommendations.TOP_K)
+        parser.add_argument('--block-size', type=int, default=1000, help='한 번에 계산할 챌린지 수 (메모리 사용량 조절)')
+
+    def handle(self, *args, **options):
+        try:
+            updated = recommendations.rebuild(
+                incremental=options['incremental'], k=options['top_k'], block_size=options['block_size'],
+            )
+        except ImportError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f'{updated}개 챌린지의 추천을 갱신했습니다.'))
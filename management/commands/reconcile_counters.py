@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...models import Challenge
+from ...participation import actual_counts, attach_sharded_counts, counter_subqueries
+from ...routers import shards
+
+
+class Command(BaseCommand):
+    help = 'Challenge.participant_count / verified_count 를 실제 참가자 행과 비교해서 다시 맞춥니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='차이만 출력하고 고치지 않음')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def report(self, batch):
+        drifted = 0
+        for challenge in batch:
+            if (challenge.participant_count, challenge.verified_count) == (
+                challenge.actual_participants, challenge.actual_verified,
+            ):
+                continue
+            self.stdout.write(
+                f'{challenge}: participants {challenge.participant_count} -> {challenge.actual_participants}, '
+                f'verified {challenge.verified_count} -> {challenge.actual_verified}'
+            )
+            drifted += 1
+        return drifted
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        checked = drifted = 0
+        last_pk = 0
+
+        while True:
+            # 보관된 챌린지는 참여 행이 옮겨졌으므로 보관할 때 고정한 카운터를 그대로 둠
+            live = Challenge.objects.filter(archive_status=Challenge.ARCHIVE_LIVE)
+            queryset = live.filter(pk__gt=last_pk).order_by('pk')
+            # 읽고 나서 따로 쓰면 그 사이에 커밋된 참여/인증의 F() 증감을 덮어쓰므로
+            # 샤드가 없으면 배치마다 UPDATE 한 문장으로 다시 세고, 샤드가 있으면 챌린지 행을 잠근 채 세어서 씀
+            # (join_challenge 도 같은 행을 잠그고 참여하므로 잠근 동안에는 카운터가 바뀌지 않음)
+            with transaction.atomic():
+                if shards():
+                    batch = attach_sharded_counts(list(queryset.select_for_update()[:batch_size]))
+                else:
+                    batch = list(actual_counts(queryset)[:batch_size])
+                if not batch:
+                    break
+                drifted += self.report(batch)
+                if not options['dry_run']:
+                    if shards():
+                        for challenge in batch:
+                            challenge.participant_count = challenge.actual_participants
+                            challenge.verified_count = challenge.actual_verified
+                        Challenge.objects.bulk_update(batch, ['participant_count', 'verified_count'])
+                    else:
+                        live.filter(pk__gt=last_pk, pk__lte=batch[-1].pk).update(**counter_subqueries())
+            last_pk = batch[-1].pk
+            checked += len(batch)
+
+        action = '발견' if options['dry_run'] else '수정'
+        self.stdout.write(self.style.SUCCESS(f'{checked}개 챌린지 확인, {drifted}개 {action}'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from ... import leaderboards
+
+
+class Command(BaseCommand):
+    help = '리더보드 집계 테이블(시간 단위 버킷, 사용자 점수, 챌린지 순위)을 증분으로 갱신합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='집계 테이블을 비우고 처음부터 다시 계산')
+
+    def handle(self, *args, **options):
+        refreshed = leaderboards.refresh(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'{refreshed}개 챌린지의 순위 값을 갱신했습니다.'))
@@ -0,0 +1,51 @@
+import os
+import socket
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from ... import jobs
+
+
+class Command(BaseCommand):
+    help = 'DB 작업 큐의 작업을 가져와 실행하는 워커를 띄웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10, help='한 번에 가져올 작업 수')
+        parser.add_argument('--sleep', type=float, default=1.0, help='대기 중인 작업이 없을 때 쉬는 시간(초)')
+        parser.add_argument('--once', action='store_true', help='대기 중인 작업이 없어지면 종료')
+        parser.add_argument('--no-periodic', action='store_true', help='주기 작업(HABIT_PERIODIC_JOBS)을 넣지 않음')
+        parser.add_argument('--worker-id', default=f'{socket.gethostname()}:{os.getpid()}')
+
+    def handle(self, *args, **options):
+        worker_id = options['worker_id']
+        done = failed = 0
+        self.stdout.write(f'worker {worker_id} started')
+        # 주기 작업은 구간마다 한 번만 들어가면 되므로 매 반복이 아니라 가장 짧은 간격(최대 1분)마다 넣음
+        periodic_every = min([60, *getattr(settings, 'HABIT_PERIODIC_JOBS', {}).values()])
+        next_periodic = 0
+
+        try:
+            while True:
+                close_old_connections()
+                if not options['no_periodic'] and time.monotonic() >= next_periodic:
+                    jobs.schedule_periodic()
+                    next_periodic = time.monotonic() + periodic_every
+                jobs.requeue_stale()
+
+                batch = jobs.claim(worker_id, options['batch_size'])
+                for job in batch:
+                    if jobs.run_job(job):
+                        done += 1
+                    else:
+                        failed += 1
+
+                if not batch:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'{done}개 완료, {failed}개 실패'))
@@ -0,0 +1,225 @@
+import contextvars
+import logging
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger('habit_stacker.slow_requests')
+
+# 프로세스 안에서만 모으는 간단한 히스토그램/카운터 (Prometheus 텍스트 형식으로 내보냄)
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+MAX_RECORDED_QUERIES = 50
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, name, labels, value, buckets=LATENCY_BUCKETS):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def increment(self, name, labels, amount=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def render(self):
+        def fmt(labels, **extra):
+            pairs = [*labels, *extra.items()]
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+        lines = []
+        with self.lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f'# TYPE {name} counter')
+                for (metric, labels), value in sorted(self.counters.items()):
+                    if metric == name:
+                        lines.append(f'{name}{fmt(labels)} {value}')
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f'# TYPE {name} histogram')
+                for (metric, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip((*histogram.buckets, '+Inf'), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{fmt(labels, le=bound)} {cumulative}')
+                    lines.append(f'{name}_sum{fmt(labels)} {round(histogram.total, 3)}')
+                    lines.append(f'{name}_count{fmt(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class RequestStats:
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.queries = []
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.sql_count += 1
+            self.sql_ms += elapsed
+            if len(self.queries) < MAX_RECORDED_QUERIES:
+                self.queries.append((round(elapsed, 3), sql))
+
+
+_current = contextvars.ContextVar('habit_request_stats', default=None)
+
+
+# DB 연결은 스레드마다 따로라서 요청마다 connections.all() 에 걸면 sync_to_async 스레드의 연결은 빠짐
+# 연결이 생길 때(signals.py 의 connection_created) 한 번만 걸어두고, 요청 정보는 contextvar 로 찾음
+# (contextvar 는 sync_to_async 로 넘어간 스레드에도 복사되므로 async 뷰/ORM 의 쿼리도 같은 요청으로 셈)
+def record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats.record_query(execute, sql, params, many, context)
+
+
+def install_query_timer(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_template_timer():
+    # render()/TemplateResponse 가 부르는 백엔드 Template.render 에 시간 측정을 끼워 넣음
+    # (include 로 불리는 하위 템플릿은 여기를 거치지 않으므로 중복으로 세지 않음)
+    from django.template.backends.django import Template
+
+    if getattr(Template.render, 'habit_timed', False):
+        return
+    original = Template.render
+
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        if stats is None:
+            return original(self, context, request)
+        start = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            stats.template_ms += (time.perf_counter() - start) * 1000
+
+    render.habit_timed = True
+    Template.render = render
+
+
+# 뷰별 SQL 개수/시간, 템플릿 렌더링 시간, 전체 지연시간을 기록하는 미들웨어
+# HABIT_METRICS_ENABLED 가 꺼져 있으면 MiddlewareNotUsed 로 아예 빠져서 오버헤드가 없음
+# ASGI 에서 async 뷰까지 스레드를 오가지 않도록 동기/비동기 둘 다 지원함
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'HABIT_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'HABIT_METRICS_SAMPLE_RATE', 1.0)
+        self.slow_ms = getattr(settings, 'HABIT_SLOW_REQUEST_MS', 500)
+        install_template_timer()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, stats, start)
+        return response
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, stats, start)
+        return response
+
+    def _record(self, request, stats, start):
+        total_ms = (time.perf_counter() - start) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        labels = {'view': match.view_name if match else 'unresolved'}
+        registry.observe('habit_request_duration_ms', labels, total_ms)
+        registry.observe('habit_request_sql_ms', labels, stats.sql_ms)
+        registry.observe('habit_request_template_ms', labels, stats.template_ms)
+        registry.observe('habit_request_sql_queries', labels, stats.sql_count, QUERY_BUCKETS)
+
+        if total_ms >= self.slow_ms:
+            logger.warning(
+                'slow request %s %s view=%s total=%.1fms sql=%d/%.1fms template=%.1fms\n%s',
+                request.method, request.path, labels['view'], total_ms, stats.sql_count, stats.sql_ms,
+                stats.template_ms, '\n'.join(f'  {ms}ms {sql}' for ms, sql in stats.queries),
+            )
+
+
+def metrics_view(request):
+    allowed = getattr(settings, 'HABIT_METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+    if request.META.get('REMOTE_ADDR') not in allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
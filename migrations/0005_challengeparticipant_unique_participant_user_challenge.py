@@ -0,0 +1,28 @@
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_participants(apps, schema_editor):
+    # 제약을 걸기 전에 (user, challenge) 중복 행은 가장 먼저 생긴 것만 남김
+    ChallengeParticipant = apps.get_model('habit_stacker', 'ChallengeParticipant')
+    keep_ids = (
+        ChallengeParticipant.objects.values('user', 'challenge')
+        .annotate(keep_id=Min('id'))
+        .values('keep_id')
+    )
+    ChallengeParticipant.objects.exclude(id__in=keep_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habit_stacker', '0004_alter_challengeparticipant_user_delete_customuser'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_participants, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='challengeparticipant',
+            constraint=models.UniqueConstraint(fields=('user', 'challenge'), name='unique_participant_user_challenge'),
+        ),
+    ]
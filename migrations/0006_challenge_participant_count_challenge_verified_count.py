@@ -0,0 +1,35 @@
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_counters(apps, schema_editor):
+    Challenge = apps.get_model('habit_stacker', 'Challenge')
+    challenges = Challenge.objects.annotate(
+        total=Count('participants'),
+        verified=Count('participants', filter=Q(participants__is_verified=True)),
+    )
+    for challenge in challenges.iterator(chunk_size=1000):
+        Challenge.objects.filter(pk=challenge.pk).update(
+            participant_count=challenge.total, verified_count=challenge.verified,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habit_stacker', '0005_challengeparticipant_unique_participant_user_challenge'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challenge',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='challenge',
+            name='verified_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
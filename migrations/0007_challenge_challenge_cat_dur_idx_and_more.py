@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habit_stacker', '0006_challenge_participant_count_challenge_verified_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='challenge',
+            index=models.Index(fields=['category', 'duration', '-id'], name='challenge_cat_dur_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='challengeparticipant',
+            index=models.Index(fields=['challenge', 'is_verified'], name='participant_chal_verified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='challengeparticipant',
+            index=models.Index(condition=models.Q(('is_verified', False)), fields=['challenge', 'user'], name='participant_unverified_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations
+
+TABLE = 'habit_stacker_challenge'
+FTS = f'{TABLE}_fts'
+
+SQLITE_FORWARD = [
+    f"CREATE VIRTUAL TABLE {FTS} USING fts5(title, description, content='{TABLE}', content_rowid='id', tokenize='unicode61')",
+    f"""CREATE TRIGGER {FTS}_ai AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER {FTS}_ad AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS}({FTS}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER {FTS}_au AFTER UPDATE OF title, description ON {TABLE} BEGIN
+        INSERT INTO {FTS}({FTS}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    f"INSERT INTO {FTS}({FTS}) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    f'DROP TRIGGER IF EXISTS {FTS}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS}_au',
+    f'DROP TABLE IF EXISTS {FTS}',
+]
+
+POSTGRES_FORWARD = [
+    f"CREATE INDEX {TABLE}_search_idx ON {TABLE} USING GIN (to_tsvector('simple', title || ' ' || description))",
+]
+POSTGRES_BACKWARD = [
+    f'DROP INDEX IF EXISTS {TABLE}_search_idx',
+]
+
+
+def _run(statements):
+    def apply(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habit_stacker', '0007_challenge_challenge_cat_dur_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
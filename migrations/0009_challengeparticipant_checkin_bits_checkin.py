@@ -0,0 +1,29 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habit_stacker', '0008_challenge_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challengeparticipant',
+            name='checkin_bits',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='CheckIn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('participant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkins', to='habit_stacker.challengeparticipant')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('participant', 'day'), name='unique_checkin_participant_day')],
+            },
+        ),
+    ]
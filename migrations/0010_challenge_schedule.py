@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+DURATION_DAYS = {
+    'For 1 week': 7,
+    'For 2 weeks': 14,
+    'For 3 weeks': 21,
+    'For 4 weeks': 28,
+}
+
+
+def fill_schedule(apps, schema_editor):
+    # 기존 챌린지는 생성 시각을 알 수 없으므로 마이그레이션 시각을 시작 시각으로 사용
+    Challenge = apps.get_model('habit_stacker', 'Challenge')
+    for duration, days in DURATION_DAYS.items():
+        Challenge.objects.filter(duration=duration).update(
+            duration_days=days, ends_at=F('starts_at') + timedelta(days=days),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habit_stacker', '0009_challengeparticipant_checkin_bits_checkin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challenge',
+            name='duration_days',
+            field=models.PositiveSmallIntegerField(default=7, editable=False),
+        ),
+        migrations.AddField(
+            model_name='challenge',
+            name='starts_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='challenge',
+            name='ends_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_schedule, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='challenge',
+            name='ends_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='challenge',
+            index=models.Index(fields=['ends_at', 'starts_at'], name='challenge_schedule_idx'),
+        ),
+    ]
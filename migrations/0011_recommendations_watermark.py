@@ -0,0 +1,47 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habit_stacker', '0010_challenge_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChallengeRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('challenge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='habit_stacker.challenge')),
+                ('recommended', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='habit_stacker.challenge')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('challenge', 'rank'), name='unique_recommendation_rank')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CategoryRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('Environment', 'Environment'), ('Exercise', 'Exercise'), ('Health', 'Health'), ('Sentiment', 'Sentiment'), ('Nutrition', 'Nutrition'), ('Hobby', 'Hobby')], max_length=20)),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('recommended', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='habit_stacker.challenge')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('category', 'rank'), name='unique_category_recommendation_rank')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Watermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('position', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,68 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+CATEGORY_CHOICES = [('Environment', 'Environment'), ('Exercise', 'Exercise'), ('Health', 'Health'), ('Sentiment', 'Sentiment'), ('Nutrition', 'Nutrition'), ('Hobby', 'Hobby')]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habit_stacker', '0011_recommendations_watermark'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challengeparticipant',
+            name='verified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ChallengeActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('joins', models.PositiveIntegerField(default=0)),
+                ('verifications', models.PositiveIntegerField(default=0)),
+                ('challenge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='habit_stacker.challenge')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('challenge', 'hour'), name='unique_activity_challenge_hour')],
+                'indexes': [models.Index(fields=['hour'], name='activity_hour_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ChallengeStats',
+            fields=[
+                ('challenge', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='habit_stacker.challenge')),
+                ('category', models.CharField(choices=CATEGORY_CHOICES, max_length=20)),
+                ('participants', models.PositiveIntegerField(default=0)),
+                ('verified', models.PositiveIntegerField(default=0)),
+                ('completion_rate', models.FloatField(default=0)),
+                ('joins_24h', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['-joins_24h'], name='stats_trending_idx'),
+                    models.Index(fields=['category', '-joins_24h'], name='stats_cat_trending_idx'),
+                    models.Index(fields=['-completion_rate', '-participants'], name='stats_completion_idx'),
+                    models.Index(fields=['category', '-completion_rate', '-participants'], name='stats_cat_completion_idx'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserCategoryScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, max_length=20)),
+                ('verified', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_scores', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'category'), name='unique_score_user_category')],
+                'indexes': [models.Index(fields=['category', '-verified'], name='score_cat_verified_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# 샤드(HABIT_DB_SHARDS)에는 User/Challenge 테이블이 없으므로 샤드의 참여 테이블에서만 외래키 제약을 뺌
+# 모델 정의(상태)와 default DB 의 제약은 그대로 둠
+# SQLite 샤드는 이 마이그레이션이 테이블을 다시 만들어 제약을 없애지만,
+# PostgreSQL 등은 0001 에서 참조 테이블이 없어 실패하므로 샤드의 참여 테이블을 외래키 없이 미리 만들고 --fake-initial 로 마이그레이션해야 함
+class AlterFieldOnShards(migrations.AlterField):
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.alias not in getattr(settings, 'HABIT_DB_SHARDS', []):
+            return
+        altered = from_state.clone()
+        super().state_forwards(app_label, altered)
+        super().database_forwards(app_label, schema_editor, from_state, altered)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.alias not in getattr(settings, 'HABIT_DB_SHARDS', []):
+            return
+        altered = to_state.clone()
+        super().state_forwards(app_label, altered)
+        super().database_forwards(app_label, schema_editor, altered, to_state)
+
+    def describe(self):
+        return f'{super().describe()} (shards only)'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habit_stacker', '0012_leaderboards'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AlterFieldOnShards(
+            model_name='challengeparticipant',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='challenge_participants', to=settings.AUTH_USER_MODEL),
+        ),
+        AlterFieldOnShards(
+            model_name='challengeparticipant',
+            name='challenge',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='habit_stacker.challenge'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habit_stacker', '0014_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challenge',
+            name='archive_status',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Live'), (1, 'Archiving'), (2, 'Archived')], default=0),
+        ),
+        migrations.CreateModel(
+            name='ParticipationArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row_count', models.PositiveIntegerField()),
+                ('columns', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='participation_archives', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
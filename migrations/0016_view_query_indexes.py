@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+# 뷰가 실제로 보내는 쿼리(explain_queries)에 맞춰 인덱스를 다시 만듦
+# - 목록은 category 로만 거르므로 duration 을 뺀 (category, -id)
+# - 참가자 인덱스 두 개는 어느 뷰도 쓰지 않음 (사용자별 조회는 (user, challenge) 유니크 제약이 처리)
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habit_stacker', '0015_participation_archive'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='challenge',
+            name='challenge_cat_dur_idx',
+        ),
+        migrations.AddIndex(
+            model_name='challenge',
+            index=models.Index(fields=['category', '-id'], name='challenge_cat_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='challengeparticipant',
+            name='participant_chal_verified_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='challengeparticipant',
+            name='participant_unverified_idx',
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habit_stacker', '0016_view_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='challenge',
+            index=models.Index(fields=['-id', 'ends_at', 'starts_at'], name='challenge_recent_schedule_idx'),
+        ),
+    ]
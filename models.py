@@ -1,7 +1,26 @@
+from datetime import timedelta
+
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth.models import User
-import bcrypt
+from . import hashing
+
+# 기간 조건은 duration 문자열이 아니라 인덱스가 걸린 ends_at 범위로 거름
+class ChallengeQuerySet(models.QuerySet):
+    ENDING_SOON = timedelta(days=3)
+
+    def active(self, now=None):
+        now = now or timezone.now()
+        return self.filter(starts_at__lte=now, ends_at__gt=now)
+
+    def ending_soon(self, now=None):
+        now = now or timezone.now()
+        return self.filter(starts_at__lte=now, ends_at__gt=now, ends_at__lte=now + self.ENDING_SOON)
+
+    def expired(self, now=None):
+        return self.filter(ends_at__lte=now or timezone.now())
+
 
 # Create your models here.
 class Challenge(models.Model):
@@ -21,12 +40,49 @@ class Challenge(models.Model):
         ('For 4 weeks', 'For 4 weeks'),
     ]
 
+    # 기간 문자열을 일 수로 바꿀 때 사용
+    DURATION_DAYS = {
+        'For 1 week': 7,
+        'For 2 weeks': 14,
+        'For 3 weeks': 21,
+        'For 4 weeks': 28,
+    }
+
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
     title = models.CharField(max_length=100)
     description = models.TextField()
     duration = models.CharField(max_length=20, choices=DURATION_CHOICES, default='For 1 week')
-    
-    
+    # duration 을 숫자로 바꿔 저장한 값과 종료 시각, save() 할 때 sync_schedule() 로 채움
+    duration_days = models.PositiveSmallIntegerField(default=7, editable=False)
+    starts_at = models.DateTimeField(default=timezone.now)
+    ends_at = models.DateTimeField(editable=False)
+    # 목록 카드에 참가자 수를 보여줄 때 매번 COUNT 하지 않도록 저장해두는 값
+    # participation.py 에서 참여/탈퇴/인증 시 F()로 갱신하고, reconcile_counters 명령으로 다시 맞춤
+    participant_count = models.PositiveIntegerField(default=0)
+    verified_count = models.PositiveIntegerField(default=0)
+    # 끝난 챌린지의 참여 기록 보관 상태 (archive.py)
+    # 보관을 시작하면 참가자/인증 카운터는 그 시점 값으로 고정되고 reconcile_counters 대상에서 빠짐
+    ARCHIVE_LIVE = 0
+    ARCHIVE_PENDING = 1
+    ARCHIVE_DONE = 2
+    ARCHIVE_CHOICES = [
+        (ARCHIVE_LIVE, 'Live'),
+        (ARCHIVE_PENDING, 'Archiving'),
+        (ARCHIVE_DONE, 'Archived'),
+    ]
+    archive_status = models.PositiveSmallIntegerField(choices=ARCHIVE_CHOICES, default=ARCHIVE_LIVE)
+
+    class Meta:
+        indexes = [
+            # 목록의 ?category= 필터 + 최신순(-pk) 커서 페이지용
+            models.Index(fields=['category', '-id'], name='challenge_cat_idx'),
+            # 곧 끝나는 챌린지(좁은 ends_at 범위)와 보관 대상(ends_at <= cutoff) 조회용
+            models.Index(fields=['ends_at', 'starts_at'], name='challenge_schedule_idx'),
+            # ?status=active 목록: 최신순(-pk)으로 인덱스를 훑으면서 기간 조건도 인덱스 안에서 거름 (정렬 단계 없음)
+            models.Index(fields=['-id', 'ends_at', 'starts_at'], name='challenge_recent_schedule_idx'),
+        ]
+
+    objects = ChallengeQuerySet.as_manager()
 
     def __str__(self):
         return f'[{self.pk}] {self.title}'
@@ -34,6 +90,20 @@ class Challenge(models.Model):
     #객체의 URL을 반환하는 메서드 정의
     def get_absolute_url(self):
         return reverse("single_challenge_page", kwargs={"pk": self.pk})
+
+    # bulk_create 는 save() 를 거치지 않으므로 직접 호출해야 함
+    def sync_schedule(self):
+        self.duration_days = self.DURATION_DAYS[self.duration]
+        if self.starts_at is None:
+            self.starts_at = timezone.now()
+        self.ends_at = self.starts_at + timedelta(days=self.duration_days)
+
+    def save(self, *args, **kwargs):
+        self.sync_schedule()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'duration', 'starts_at'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'duration_days', 'ends_at'}
+        super().save(*args, **kwargs)
     
 
 # 챌린지에 참여한 사용자를 관리하는 모델
@@ -47,19 +117,193 @@ class ChallengeParticipant(models.Model):
     challenge = models.ForeignKey(Challenge, on_delete=models.CASCADE,related_name='participants')
     join_data = models.DateTimeField(auto_now_add=True) # 참가한 날짜 및 시간 기록
     is_verified = models.BooleanField(default=False) # 사용자가 해당 챌린지에서 인증을 완료했는지 여부를 저장하는 필드, 기본값(default)는 False임. 사용자가 인증을 완료하면 True로 변경할 수 있음
+    # 날짜별 체크인 비트맵: 참여한 날을 0번 비트로 해서 체크인한 날의 비트를 켬 (최대 28일 = 28비트)
+    # 연속 일수, 달성률 등은 checkins.py 에서 비트 연산으로 계산함
+    checkin_bits = models.PositiveIntegerField(default=0)
+    verified_at = models.DateTimeField(null=True, blank=True) # 인증 완료 시각 (리더보드 집계용)
+
+    class Meta:
+        # 한 사용자는 같은 챌린지에 한 번만 참여할 수 있음 (중복 참여 방지)
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'challenge'], name='unique_participant_user_challenge'),
+        ]
 
     # ChallengeParticipant 객체가 출력될 때, 참가한 사용자의 username과 해당 사용자가 참여한 챌린지의 title이 표시되도록 설정했음
     # 예) Newuser2 - 5km running
     def __str__(self):
         return f'{self.user.username} - {self.challenge.title}'
     
+# 체크인 기록 (추가만 하는 원장), 같은 날 두 번 체크인할 수 없음
+class CheckIn(models.Model):
+    participant = models.ForeignKey(ChallengeParticipant, on_delete=models.CASCADE, related_name='checkins')
+    day = models.PositiveSmallIntegerField() # 참여한 날 기준 몇 번째 날인지 (0부터 시작)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['participant', 'day'], name='unique_checkin_participant_day'),
+        ]
+
+    def __str__(self):
+        return f'{self.participant} - day {self.day + 1}'
+
+# "이 챌린지에 참여한 사람들이 함께 참여한 챌린지" 상위 K개 (recommendations.py 에서 미리 계산)
+class ChallengeRecommendation(models.Model):
+    challenge = models.ForeignKey(Challenge, on_delete=models.CASCADE, related_name='recommendations')
+    recommended = models.ForeignKey(Challenge, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        # (challenge, rank) 유니크 인덱스 하나로 상세 페이지 추천을 순서대로 읽음
+        constraints = [
+            models.UniqueConstraint(fields=['challenge', 'rank'], name='unique_recommendation_rank'),
+        ]
+
+# 카테고리별 추천: 해당 카테고리 챌린지에 참여한 사용자들이 많이 참여한 챌린지
+class CategoryRecommendation(models.Model):
+    category = models.CharField(max_length=20, choices=Challenge.CATEGORY_CHOICES)
+    recommended = models.ForeignKey(Challenge, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['category', 'rank'], name='unique_category_recommendation_rank'),
+        ]
+
+# 증분 작업이 어디까지 처리했는지 기록 (예: 마지막으로 반영한 ChallengeParticipant id)
+class Watermark(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.name}: {self.position}'
+
+# 리더보드용 집계 테이블 (leaderboards.py 의 refresh 가 증분으로 갱신)
+# 챌린지별 시간 단위 참여/인증 수
+class ChallengeActivity(models.Model):
+    challenge = models.ForeignKey(Challenge, on_delete=models.CASCADE, related_name='activity')
+    hour = models.DateTimeField()
+    joins = models.PositiveIntegerField(default=0)
+    verifications = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['challenge', 'hour'], name='unique_activity_challenge_hour'),
+        ]
+        indexes = [
+            models.Index(fields=['hour'], name='activity_hour_idx'),
+        ]
+
+# 챌린지별 순위 값 (완료율, 최근 24시간 참여 수) - 인덱스 순서대로 한 페이지만 읽음
+class ChallengeStats(models.Model):
+    challenge = models.OneToOneField(Challenge, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    category = models.CharField(max_length=20, choices=Challenge.CATEGORY_CHOICES)
+    participants = models.PositiveIntegerField(default=0)
+    verified = models.PositiveIntegerField(default=0)
+    completion_rate = models.FloatField(default=0)
+    joins_24h = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-joins_24h'], name='stats_trending_idx'),
+            models.Index(fields=['category', '-joins_24h'], name='stats_cat_trending_idx'),
+            models.Index(fields=['-completion_rate', '-participants'], name='stats_completion_idx'),
+            models.Index(fields=['category', '-completion_rate', '-participants'], name='stats_cat_completion_idx'),
+        ]
+
+# 사용자별 인증 완료 수 (category 가 빈 문자열이면 전체)
+class UserCategoryScore(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='category_scores')
+    category = models.CharField(max_length=20, blank=True)
+    verified = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category'], name='unique_score_user_category'),
+        ]
+        indexes = [
+            models.Index(fields=['category', '-verified'], name='score_cat_verified_idx'),
+        ]
+
+# 끝난 챌린지의 참여 기록 보관 테이블 (archive.py)
+# 한 행에 한 사용자의 참여 기록 여러 개를 열(column) 단위 JSON 으로 묶어 zlib 으로 압축해서 저장함
+# 사용자 기준으로 묶으므로 참여 기록과 같은 샤드에 들어감
+class ParticipationArchive(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='participation_archives', db_constraint=False)
+    row_count = models.PositiveIntegerField()
+    columns = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.user_id}: {self.row_count} rows'
+
+# DB 기반 작업 큐 (jobs.py), 워커는 manage.py run_jobs 로 실행
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100) # jobs.register 로 등록한 작업 이름
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    run_at = models.DateTimeField(default=timezone.now) # 이 시각 이후에 실행 (재시도 대기 포함)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    locked_by = models.CharField(max_length=100, blank=True) # 작업을 가져간 워커
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    # 같은 작업을 두 번 넣지 않도록 하는 키 (예: 'periodic:refresh_leaderboards:<구간>')
+    unique_key = models.CharField(max_length=200, null=True, blank=True, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # 워커가 실행할 작업을 run_at 순서로 가져갈 때 대기 중인 작업만 훑음
+            models.Index(fields=['run_at'], condition=models.Q(status='queued'), name='job_ready_idx'),
+            # 멈춘 워커의 작업을 되돌릴 때 사용
+            models.Index(fields=['locked_at'], condition=models.Q(status='running'), name='job_running_idx'),
+        ]
+
+    def __str__(self):
+        return f'[{self.pk}] {self.name} ({self.status})'
+
 class User(models.Model):
     email = models.EmailField(unique=True)
     password = models.CharField(max_length=60)  # bcrypt 해시를 저장하기 위한 충분한 길이
     created_at = models.DateTimeField(auto_now_add=True)
 
     def set_password(self, raw_password):
-        self.password = bcrypt.hashpw(raw_password.encode(), bcrypt.gensalt()).decode()
+        self.password = hashing.hash_password(raw_password)
 
+    # 비밀번호가 맞고 저장된 해시의 cost 가 예전 값이면 새 cost 로 다시 저장함
     def check_password(self, raw_password):
-        return bcrypt.checkpw(raw_password.encode(), self.password.encode())
\ No newline at end of file
+        valid = hashing.check_password(raw_password, self.password)
+        if valid and hashing.needs_rehash(self.password):
+            self.set_password(raw_password)
+            if self.pk:
+                self.save(update_fields=['password'])
+        return valid
+
+    # ASGI 뷰에서 쓰는 버전: 해시 계산은 프로세스 풀에서 돌아서 이벤트 루프를 막지 않음
+    async def aset_password(self, raw_password):
+        self.password = await hashing.ahash_password(raw_password)
+
+    async def acheck_password(self, raw_password):
+        valid = await hashing.acheck_password(raw_password, self.password)
+        if valid and hashing.needs_rehash(self.password):
+            await self.aset_password(raw_password)
+            if self.pk:
+                await self.asave(update_fields=['password'])
+        return valid
\ No newline at end of file
@@ -0,0 +1,157 @@
+import base64
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import InvalidPage
+from django.http import Http404
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+# 커서는 (방향, pk)를 base64로 감싼 불투명한 문자열
+# 'n' = 이 pk 다음 페이지, 'p' = 이 pk 이전 페이지
+def encode_cursor(pk, direction):
+    raw = json.dumps([direction, pk], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        direction, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursor('잘못된 커서입니다.')
+    if direction not in ('n', 'p') or not isinstance(pk, int):
+        raise InvalidCursor('잘못된 커서입니다.')
+    return direction, pk
+
+
+# 목록 링크에서 필터(?category= 등)는 그대로 두고 페이지만 바꾸도록, 커서/페이지 번호를 뺀 쿼리스트링 앞부분을 만듦
+# 템플릿에서 ?{{ cursor_query }}cursor={{ page_obj.next_cursor }} 처럼 씀
+def cursor_query_prefix(params, cursor_kwarg='cursor'):
+    params = params.copy()
+    params.pop(cursor_kwarg, None)
+    params.pop('page', None)
+    query = params.urlencode()
+    return f'{query}&' if query else ''
+
+
+class CursorPage:
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage {len(self.object_list)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+# OFFSET/COUNT(*) 없이 pk 기준으로 seek 하는 페이지네이터
+# 전체 개수가 필요하면 count 를 캐시에서 읽고, 없을 때만 한 번 계산함
+class CursorPaginator:
+    def __init__(self, queryset, per_page, descending=True, count_timeout=60):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.descending = descending
+        self.count_timeout = count_timeout
+
+    @property
+    def count(self):
+        # 필터마다 개수가 다르므로 SQL 문 해시를 키에 넣음
+        try:
+            sql = str(self.queryset.query)
+        except EmptyResultSet:
+            return 0
+        digest = hashlib.sha1(sql.encode()).hexdigest()[:16]
+        key = f'pagination:count:{self.queryset.model._meta.label_lower}:{digest}'
+        value = cache.get(key)
+        if value is None:
+            value = self.queryset.count()
+            cache.set(key, value, self.count_timeout)
+        return value
+
+    def _seek(self, cursor):
+        direction, pk = decode_cursor(cursor) if cursor else ('n', None)
+
+        # 이전 페이지로 갈 때는 정렬을 뒤집어서 가져온 뒤 다시 뒤집음
+        forward = direction == 'n'
+        descending = self.descending if forward else not self.descending
+        queryset = self.queryset.order_by('-pk' if descending else 'pk')
+        if pk is not None:
+            queryset = queryset.filter(**{'pk__lt' if descending else 'pk__gt': pk})
+        return queryset[:self.per_page + 1], forward, pk
+
+    def _build_page(self, rows, forward, pk):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+
+        if forward:
+            has_next, has_previous = has_more, pk is not None
+        else:
+            has_next, has_previous = True, has_more
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(rows[-1].pk, 'n')
+        if rows and has_previous:
+            previous_cursor = encode_cursor(rows[0].pk, 'p')
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+    def page(self, cursor=None):
+        queryset, forward, pk = self._seek(cursor)
+        return self._build_page(list(queryset), forward, pk)
+
+    async def apage(self, cursor=None):
+        queryset, forward, pk = self._seek(cursor)
+        return self._build_page([row async for row in queryset], forward, pk)
+
+
+# ListView 에 섞어서 쓰는 믹스인
+# pagination_mode = 'offset' 이면 장고 기본 페이지네이션을 그대로 사용함
+class CursorPaginationMixin:
+    pagination_mode = 'cursor'
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.pagination_mode != 'cursor':
+            return super().paginate_queryset(queryset, page_size)
+
+        ordering = self.get_ordering() or '-pk'
+        if isinstance(ordering, (list, tuple)):
+            ordering = ordering[0]
+        paginator = CursorPaginator(queryset, page_size, descending=ordering.startswith('-'))
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['cursor_query'] = cursor_query_prefix(self.request.GET, self.cursor_kwarg)
+        return context
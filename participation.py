@@ -0,0 +1,186 @@
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import events, jobs
+from .archive import aarchived_challenge_ids, archived_challenge_ids
+from .fragments import bump_challenge_version
+from .models import Challenge, ChallengeParticipant
+from .routers import each_shard, participants_for, shard_for, shards
+
+JOINED_TIMEOUT = 60 * 60
+
+
+# 다른 워커에서 참여/탈퇴해도 바로 보이도록 워커끼리 공유하는 'shared' 캐시에 둠
+def _cache():
+    return caches['shared']
+
+
+def _joined_key(user_id):
+    return f'participation:joined:{user_id}'
+
+
+# 사용자가 참여한 챌린지 id 집합을 캐시에 한 번만 올려두고 재사용함
+# 참여/탈퇴가 커밋되면 signals.py 에서 invalidate_joined 로 지움
+def get_joined_challenge_ids(user_id):
+    key = _joined_key(user_id)
+    ids = _cache().get(key)
+    if ids is None:
+        ids = frozenset(participants_for(user_id).values_list('challenge_id', flat=True)) | archived_challenge_ids(user_id)
+        _cache().set(key, ids, JOINED_TIMEOUT)
+    return ids
+
+
+async def aget_joined_challenge_ids(user_id):
+    key = _joined_key(user_id)
+    ids = await _cache().aget(key)
+    if ids is None:
+        queryset = participants_for(user_id).values_list('challenge_id', flat=True)
+        ids = frozenset([challenge_id async for challenge_id in queryset]) | await aarchived_challenge_ids(user_id)
+        await _cache().aset(key, ids, JOINED_TIMEOUT)
+    return ids
+
+
+def has_joined(user, challenge_id):
+    return int(challenge_id) in get_joined_challenge_ids(user.pk)
+
+
+async def ahas_joined(user, challenge_id):
+    return int(challenge_id) in await aget_joined_challenge_ids(user.pk)
+
+
+def invalidate_joined(user_id):
+    _cache().delete(_joined_key(user_id))
+
+
+def _bump_counters(challenge_id, participants=0, verified=0):
+    Challenge.objects.filter(pk=challenge_id).update(
+        participant_count=F('participant_count') + participants,
+        verified_count=F('verified_count') + verified,
+    )
+    # 카드와 상세 페이지에 카운터가 보이므로 캐시된 조각도 갱신
+    transaction.on_commit(lambda: bump_challenge_version(challenge_id))
+
+
+# 끝나서 보관 중/보관된 챌린지에는 새 참여 행을 만들지 않음
+# 호출한 쪽의 Challenge 객체는 오래됐을 수 있으므로 트랜잭션 안에서 행을 잠그고 DB 값으로 확인함
+# (archive.mark_finished 의 UPDATE 는 참여가 커밋될 때까지 기다리므로 그 참여 행도 보관 대상에 들어감)
+def _lock_live(challenge_id):
+    return Challenge.objects.select_for_update().filter(pk=challenge_id, archive_status=Challenge.ARCHIVE_LIVE).exists()
+
+
+# 여러 번 호출해도 (user, challenge) 행은 하나만 생김
+# 동시에 들어온 요청이 유니크 제약에 걸리면 get_or_create 가 기존 행을 다시 읽어옴
+# 참여 기록이 다른 샤드에 있어도 카운터(default)와 같이 커밋되도록 두 DB 모두 트랜잭션으로 묶음
+def join_challenge(user, challenge):
+    with transaction.atomic(), transaction.atomic(using=shard_for(user.pk)):
+        if not _lock_live(challenge.pk):
+            return None, False
+        participant, created = participants_for(user.pk).get_or_create(user=user, challenge=challenge)
+        if created:
+            _bump_counters(challenge.pk, participants=1)
+            transaction.on_commit(lambda: events.publish(challenge.pk, 'joins'))
+            # 참여 확인 메일은 요청 밖에서 워커가 보냄 (같은 트랜잭션으로 들어가서 롤백되면 같이 사라짐)
+            jobs.enqueue('send_join_confirmation', {'user_id': user.pk, 'challenge_id': challenge.pk})
+    return participant, created
+
+
+def leave_challenge(user, challenge):
+    with transaction.atomic(), transaction.atomic(using=shard_for(user.pk)):
+        participant = participants_for(user.pk).filter(challenge=challenge).first()
+        if participant is None:
+            return False
+        # 동시에 탈퇴 요청이 와도 실제로 지운 쪽만 카운터를 줄임
+        _, deleted = participants_for(user.pk).filter(pk=participant.pk).delete()
+        if not deleted.get(ChallengeParticipant._meta.label):
+            return False
+        _bump_counters(challenge.pk, participants=-1, verified=-1 if participant.is_verified else 0)
+    return True
+
+
+def set_verified(participant, verified=True):
+    with transaction.atomic(), transaction.atomic(using=shard_for(participant.user_id)):
+        updated = participants_for(participant.user_id).filter(
+            pk=participant.pk, is_verified=not verified,
+        ).update(is_verified=verified, verified_at=timezone.now() if verified else None)
+        if updated:
+            _bump_counters(participant.challenge_id, verified=1 if verified else -1)
+    participant.is_verified = verified
+    return bool(updated)
+
+
+def counter_subqueries():
+    # 챌린지별 실제 참가자 수 / 인증 수를 계산하는 서브쿼리
+    participants = ChallengeParticipant.objects.filter(challenge=OuterRef('pk')).order_by().values('challenge')
+    total = participants.annotate(n=Count('pk')).values('n')
+    verified = participants.filter(is_verified=True).annotate(n=Count('pk')).values('n')
+    return {
+        'participant_count': Coalesce(Subquery(total), 0),
+        'verified_count': Coalesce(Subquery(verified), 0),
+    }
+
+
+# 참여 기록이 샤드에 나뉘어 있으면 서브쿼리로 셀 수 없으므로 샤드별로 세서 더함
+def sharded_counts(challenge_id):
+    totals = {'participant_count': 0, 'verified_count': 0}
+    for db in each_shard():
+        counts = ChallengeParticipant.objects.using(db).filter(challenge_id=challenge_id).aggregate(
+            participant_count=Count('pk'),
+            verified_count=Count('pk', filter=Q(is_verified=True)),
+        )
+        for name in totals:
+            totals[name] += counts[name]
+    return totals
+
+
+def actual_counts(queryset):
+    return queryset.annotate(
+        actual_participants=Count('participants'),
+        actual_verified=Count('participants', filter=Q(participants__is_verified=True)),
+    )
+
+
+# actual_counts 의 샤드 버전: 챌린지 목록에 actual_participants / actual_verified 를 채워서 돌려줌
+def attach_sharded_counts(challenges):
+    by_id = {challenge.pk: challenge for challenge in challenges}
+    for challenge in challenges:
+        challenge.actual_participants = challenge.actual_verified = 0
+    for db in each_shard():
+        rows = (
+            ChallengeParticipant.objects.using(db).filter(challenge_id__in=by_id)
+            .values('challenge_id')
+            .annotate(n=Count('pk'), verified=Count('pk', filter=Q(is_verified=True)))
+            .order_by()
+        )
+        for row in rows:
+            challenge = by_id[row['challenge_id']]
+            challenge.actual_participants += row['n']
+            challenge.actual_verified += row['verified']
+    return challenges
+
+
+# 여러 사용자를 한 챌린지에 한 번에 등록 (INSERT ... ON CONFLICT DO NOTHING)
+# bulk_create 는 시그널을 보내지 않고 몇 행이 들어갔는지도 모르므로 캐시와 카운터를 직접 맞춤
+def bulk_join(challenge, users, batch_size=1000):
+    user_ids = [getattr(user, 'pk', user) for user in users]
+    by_shard = {}
+    for user_id in user_ids:
+        by_shard.setdefault(shard_for(user_id), []).append(user_id)
+    with transaction.atomic():
+        if not _lock_live(challenge.pk):
+            return
+        for db, shard_user_ids in by_shard.items():
+            ChallengeParticipant.objects.using(db).bulk_create(
+                [ChallengeParticipant(user_id=user_id, challenge=challenge) for user_id in shard_user_ids],
+                batch_size=batch_size,
+                ignore_conflicts=True,
+            )
+        if shards():
+            Challenge.objects.filter(pk=challenge.pk).update(**sharded_counts(challenge.pk))
+        else:
+            Challenge.objects.filter(pk=challenge.pk).update(**counter_subqueries())
+    bump_challenge_version(challenge.pk)
+    _cache().delete_many([_joined_key(user_id) for user_id in user_ids])
+    events.publish(challenge.pk, 'joins', count=len(user_ids))
@@ -0,0 +1,65 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .metrics import registry
+
+# 토큰 버킷 방식 요청 제한 (IP, 이메일별)
+# 상태 (남은 토큰, 마지막 갱신 시각) 는 캐시에 저장함, 기본은 로컬 메모리 캐시('ratelimit')
+# 여러 프로세스가 같은 캐시를 쓰면 동시에 읽고 쓰는 사이에 약간 더 허용될 수 있음
+
+DEFAULT_RATES = {
+    # 이름: (버킷 크기, 가득 차는 데 걸리는 초)
+    'login_ip': (20, 60),
+    'login_email': (5, 300),
+    'signup_ip': (5, 3600),
+    'signup_email': (3, 3600),
+}
+
+_lock = threading.Lock()
+
+
+class TokenBucket:
+    def __init__(self, name, capacity, period, cache_alias='ratelimit'):
+        self.name = name
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.timeout = math.ceil(period) + 1
+        self.cache_alias = cache_alias
+
+    def consume(self, key, tokens=1):
+        cache = caches[self.cache_alias]
+        cache_key = f'ratelimit:{self.name}:{key}'
+        with _lock:
+            now = time.time()
+            available, updated = cache.get(cache_key) or (self.capacity, now)
+            available = min(self.capacity, available + (now - updated) * self.rate)
+            allowed = available >= tokens
+            if allowed:
+                available -= tokens
+            cache.set(cache_key, (available, now), self.timeout)
+        if not allowed:
+            registry.increment('habit_ratelimit_rejected_total', {'bucket': self.name})
+        return allowed
+
+
+def get_bucket(name):
+    capacity, period = getattr(settings, 'HABIT_RATE_LIMITS', {}).get(name, DEFAULT_RATES[name])
+    return TokenBucket(name, capacity, period)
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+# 비밀번호 해시 계산 전에 부르는 검사: IP 버킷과 (이메일이 있으면) 이메일 버킷 모두 통과해야 함
+def allow(request, prefix):
+    if not getattr(settings, 'HABIT_RATE_LIMIT_ENABLED', True):
+        return True
+    if not get_bucket(f'{prefix}_ip').consume(client_ip(request)):
+        return False
+    email = request.POST.get('email', '').strip().lower()
+    return not email or get_bucket(f'{prefix}_email').consume(email)
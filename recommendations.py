@@ -0,0 +1,201 @@
+from django.db import transaction
+from django.db.models import Max, Sum
+
+from .archive import archived_pairs
+from .fragments import bump_challenge_version
+from .models import (
+    CategoryRecommendation, Challenge, ChallengeParticipant, ChallengeRecommendation, ParticipationArchive, Watermark,
+)
+from .routers import each_shard
+
+# 사용자-챌린지 참여 행렬 X (희소 행렬) 로 "함께 참여한 챌린지" 추천을 계산
+# 챌린지 i, j 의 점수 = 둘 다 참여한 사용자 수 / sqrt(i 참여자 수 * j 참여자 수) (코사인 유사도)
+# X.T @ X 전체를 만들지 않고 챌린지 block_size 개씩 나눠 계산해서 메모리 사용량을 제한함
+# numpy/scipy 는 이 기능에만 필요하므로 함수 안에서 불러옴
+# 참여 기록이 샤드에 나뉘어 있으면 샤드마다 읽어서 합침 (참여 id 가 샤드마다 따로 매겨지므로 max_ids/워터마크도 샤드별)
+
+TOP_K = 10
+WATERMARK = 'recommendations'
+
+
+def _require_scipy():
+    try:
+        import numpy as np
+        from scipy import sparse
+    except ImportError as e:
+        raise ImportError('추천 계산에는 numpy 와 scipy 가 필요합니다.') from e
+    return np, sparse
+
+
+def _watermark_name(db):
+    return WATERMARK if db == 'default' else f'{WATERMARK}:{db}'
+
+
+def max_ids():
+    return {
+        db: ChallengeParticipant.objects.using(db).aggregate(max_id=Max('pk'))['max_id'] or 0
+        for db in each_shard()
+    }
+
+
+def load_matrix(max_ids, chunk_size=500_000):
+    """샤드마다 id <= max_ids[db] 인 참여 기록과 보관된 참여 기록으로 (X, challenge_ids) 를 만듦 - X 는 사용자 x 챌린지 CSC 행렬"""
+    np, sparse = _require_scipy()
+    querysets = [
+        ChallengeParticipant.objects.using(db).filter(pk__lte=max_id).order_by().values_list('user_id', 'challenge_id')
+        for db, max_id in max_ids.items()
+    ]
+    # 끝난 챌린지의 기록은 보관 테이블로 옮겨지므로 같이 읽어야 과거 공동 참여가 추천에서 빠지지 않음
+    total = sum(queryset.count() for queryset in querysets) + sum(
+        ParticipationArchive.objects.using(db).aggregate(n=Sum('row_count'))['n'] or 0 for db in max_ids
+    )
+    pairs = np.empty((total, 2), dtype=np.int64)
+    position = 0
+    buffer = []
+
+    def flush():
+        nonlocal position
+        if buffer:
+            block = np.asarray(buffer, dtype=np.int64)[:total - position]
+            pairs[position:position + len(block)] = block
+            position += len(block)
+            buffer.clear()
+
+    sources = [queryset.iterator(chunk_size=chunk_size) for queryset in querysets]
+    sources += [archived_pairs(db) for db in max_ids]
+    for source in sources:
+        for row in source:
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                flush()
+    flush()
+    pairs = pairs[:position]
+
+    user_ids, user_index = np.unique(pairs[:, 0], return_inverse=True)
+    challenge_ids, challenge_index = np.unique(pairs[:, 1], return_inverse=True)
+    del pairs
+    matrix = sparse.csc_matrix(
+        (np.ones(len(user_index), dtype=np.float32), (user_index, challenge_index)),
+        shape=(len(user_ids), len(challenge_ids)),
+    )
+    # 읽는 사이에 보관 테이블로 옮겨진 기록은 두 번 들어갈 수 있으므로 합쳐진 값을 1로 되돌림
+    matrix.data[:] = 1
+    return matrix, challenge_ids
+
+
+def _top_k(np, scores, k):
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+def iter_top_k(matrix, challenge_ids, columns, k=TOP_K, block_size=1000):
+    """columns 에 해당하는 챌린지마다 (챌린지 id, [(추천 id, 점수), ...]) 를 돌려줌"""
+    np, _ = _require_scipy()
+    norms = np.sqrt(np.asarray(matrix.sum(axis=0)).ravel())
+    for start in range(0, len(columns), block_size):
+        block = columns[start:start + block_size]
+        co = (matrix[:, block].T @ matrix).tocsr()
+        for row, column in enumerate(block):
+            begin, end = co.indptr[row], co.indptr[row + 1]
+            neighbors, counts = co.indices[begin:end], co.data[begin:end]
+            keep = neighbors != column
+            neighbors, counts = neighbors[keep], counts[keep]
+            scores = counts / (norms[column] * norms[neighbors])
+            yield int(challenge_ids[column]), [
+                (int(challenge_ids[neighbors[i]]), float(scores[i])) for i in _top_k(np, scores, k)
+            ]
+
+
+def save_recommendations(items, batch_size=1000):
+    updated = 0
+    batch = []
+
+    def flush():
+        challenge_ids = [challenge_id for challenge_id, _ in batch]
+        with transaction.atomic():
+            ChallengeRecommendation.objects.filter(challenge_id__in=challenge_ids).delete()
+            ChallengeRecommendation.objects.bulk_create([
+                ChallengeRecommendation(challenge_id=challenge_id, recommended_id=recommended_id, rank=rank, score=score)
+                for challenge_id, ranked in batch
+                for rank, (recommended_id, score) in enumerate(ranked)
+            ])
+        for challenge_id in challenge_ids:
+            bump_challenge_version(challenge_id)
+        batch.clear()
+
+    for item in items:
+        batch.append(item)
+        updated += 1
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return updated
+
+
+def rebuild_category_recommendations(matrix, challenge_ids, k=TOP_K):
+    np, _ = _require_scipy()
+    category_of = dict(Challenge.objects.values_list('pk', 'category').iterator(chunk_size=10_000))
+    categories = np.array([category_of.get(int(pk), '') for pk in challenge_ids])
+    rows = []
+    for category, _ in Challenge.CATEGORY_CHOICES:
+        columns = np.flatnonzero(categories == category)
+        if not len(columns):
+            continue
+        # 이 카테고리 챌린지에 하나라도 참여한 사용자들이 각 챌린지에 몇 명 참여했는지
+        members = (np.asarray(matrix[:, columns].sum(axis=1)).ravel() > 0).astype(np.float32)
+        scores = matrix.T @ members
+        for rank, index in enumerate(_top_k(np, scores, k)):
+            if scores[index] > 0:
+                rows.append(CategoryRecommendation(
+                    category=category, recommended_id=int(challenge_ids[index]), rank=rank, score=float(scores[index]),
+                ))
+    with transaction.atomic():
+        CategoryRecommendation.objects.all().delete()
+        CategoryRecommendation.objects.bulk_create(rows)
+
+
+def dirty_challenge_ids(after_ids, max_ids):
+    # 새 참여 (u, c) 는 c 와, u 가 참여한 모든 챌린지의 추천을 바꿈
+    # 한 사용자의 참여 기록은 한 샤드에만 있으므로 샤드 안에서만 찾으면 됨
+    dirty = set()
+    for db, max_id in max_ids.items():
+        participants = ChallengeParticipant.objects.using(db)
+        new = participants.filter(pk__gt=after_ids.get(db, 0), pk__lte=max_id)
+        dirty.update(new.values_list('challenge_id', flat=True).distinct())
+        dirty.update(
+            participants.filter(user_id__in=new.values('user_id'))
+            .values_list('challenge_id', flat=True).distinct()
+        )
+    return dirty
+
+
+def rebuild(incremental=False, k=TOP_K, block_size=1000):
+    """추천 테이블을 다시 계산하고 다시 계산한 챌린지 수를 반환"""
+    np, _ = _require_scipy()
+    current = max_ids()
+    watermarks = {db: Watermark.objects.get_or_create(name=_watermark_name(db))[0] for db in current}
+    after_ids = {db: watermark.position for db, watermark in watermarks.items()}
+    if incremental and all(current[db] <= after_ids[db] for db in current):
+        return 0
+
+    matrix, challenge_ids = load_matrix(current)
+    if incremental:
+        dirty = dirty_challenge_ids(after_ids, current)
+        columns = np.flatnonzero(np.isin(challenge_ids, np.fromiter(dirty, dtype=np.int64)))
+    else:
+        columns = np.arange(len(challenge_ids))
+
+    updated = save_recommendations(iter_top_k(matrix, challenge_ids, columns, k, block_size))
+    if not incremental:
+        # 참가자가 없어진 챌린지의 예전 추천은 지움
+        ChallengeRecommendation.objects.filter(challenge__participant_count=0).delete()
+    rebuild_category_recommendations(matrix, challenge_ids, k)
+
+    for db, watermark in watermarks.items():
+        watermark.position = current[db]
+        watermark.save(update_fields=['position', 'updated_at'])
+    return updated
@@ -0,0 +1,96 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from . import jobs
+from .checkins import day_index
+from .models import Challenge, ChallengeParticipant
+from .routers import each_shard
+
+# 오늘 체크인하지 않은 참가자에게 보내는 리마인더
+# 참가자 pk 순서로 HABIT_REMINDER_CHUNK 개씩 나눠서, 한 덩어리 = 작업 하나로 처리함
+# 덩어리를 처리하기 전에 다음 덩어리 작업부터 넣어두므로 워커 여러 개가 나눠서 돌고,
+# 중간에 멈춰도 (날짜, 샤드, 시작 pk) 키로 남은 작업에서 이어서 진행됨
+
+
+def _chunk_size():
+    return getattr(settings, 'HABIT_REMINDER_CHUNK', 2000)
+
+
+def _chunk_key(date, db, after):
+    return f'reminders:{date}:{db}:{after}'
+
+
+# 하루 한 번 (HABIT_PERIODIC_JOBS) 실행, 샤드마다 첫 덩어리 작업을 넣음
+def schedule_daily_reminders(date=None):
+    date = date or timezone.localdate().isoformat()
+    for db in each_shard():
+        jobs.enqueue(
+            'send_reminder_chunk', {'date': date, 'db': db, 'after': 0}, unique_key=_chunk_key(date, db, 0),
+        )
+
+
+def _pending(participants, challenges, now):
+    for participant in participants:
+        challenge = challenges.get(participant.challenge_id)
+        if challenge is None:
+            continue
+        day = day_index(participant, now, challenge)
+        if 0 <= day < challenge.duration_days and not participant.checkin_bits >> day & 1:
+            yield participant, challenge
+
+
+def send_reminder_chunk(date, db, after):
+    now = timezone.now()
+    # 미인증 참가자를 기본 키 순서로 한 청크씩 훑음 (pk 범위 스캔)
+    participants = list(
+        ChallengeParticipant.objects.using(db)
+        .filter(is_verified=False, pk__gt=after)
+        .only('pk', 'user_id', 'challenge_id', 'join_data', 'checkin_bits')
+        .order_by('pk')[:_chunk_size()]
+    )
+    if not participants:
+        return 0
+
+    last_pk = participants[-1].pk
+    if len(participants) == _chunk_size():
+        jobs.enqueue(
+            'send_reminder_chunk', {'date': date, 'db': db, 'after': last_pk},
+            unique_key=_chunk_key(date, db, last_pk),
+        )
+
+    challenges = Challenge.objects.active(now).only('pk', 'title', 'duration_days', 'starts_at').in_bulk(
+        {participant.challenge_id for participant in participants}
+    )
+    pending = list(_pending(participants, challenges, now))
+    emails = dict(
+        User.objects.filter(pk__in={participant.user_id for participant in pending})
+        .exclude(email='')
+        .values_list('pk', 'email')
+    )
+    messages = [
+        EmailMessage(
+            f'[habit_stacker] 오늘 "{challenge.title}" 체크인을 잊지 마세요',
+            f'"{challenge.title}" 챌린지 {day_index(participant, now, challenge) + 1}일째입니다. 오늘 체크인을 완료해주세요.',
+            to=[emails[participant.user_id]],
+        )
+        for participant, challenge in pending
+        if participant.user_id in emails
+    ]
+    if messages:
+        # SMTP 연결 하나로 덩어리 전체를 보냄
+        get_connection().send_messages(messages)
+    return len(messages)
+
+
+def send_join_confirmation(user_id, challenge_id):
+    user = User.objects.filter(pk=user_id).exclude(email='').first()
+    challenge = Challenge.objects.filter(pk=challenge_id).first()
+    if user is None or challenge is None:
+        return
+    EmailMessage(
+        f'[habit_stacker] "{challenge.title}" 챌린지에 참여했습니다',
+        f'{challenge.duration} 동안 매일 체크인해서 챌린지를 완료해보세요.',
+        to=[user.email],
+    ).send()
@@ -0,0 +1,202 @@
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+# 읽기 복제본 / 참여 기록 샤드 라우팅 (settings.DATABASE_ROUTERS)
+# - 읽기는 HABIT_DB_REPLICAS 중 하나로, 쓰기는 default 로 보냄
+# - 요청 중에 한 번이라도 쓰면 쿠키를 남겨서 HABIT_DB_STICKY_SECONDS 동안은 그 사용자의 읽기도 default 로 보냄
+#   (복제 지연 때문에 방금 참여한 챌린지가 안 보이는 일을 막음)
+# - HABIT_DB_SHARDS 가 있으면 ChallengeParticipant/CheckIn/ParticipationArchive 를 user_id 로 나눠 저장함
+#   어느 샤드인지는 user_id 로만 알 수 있으므로 participants_for() 로 조회하거나, 전체를 훑을 때는 each_shard() 마다 .using(db) 로 조회해야 함
+#   어느 쪽도 아닌 조회는 빈 default 테이블을 읽지 않도록 ShardRoutingError 를 냄
+
+SHARDED_MODELS = {'challengeparticipant', 'checkin', 'participationarchive'}
+STICKY_COOKIE = 'habit_db_pinned'
+
+
+class ShardRoutingError(RuntimeError):
+    pass
+
+
+class RoutingState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+# 요청마다 미들웨어가 새 상태를 넣음, 요청 밖(명령어, 워커)에서는 None -> 항상 default 에서 읽음
+_state = contextvars.ContextVar('habit_db_routing', default=None)
+
+
+def replicas():
+    return getattr(settings, 'HABIT_DB_REPLICAS', [])
+
+
+def shards():
+    return getattr(settings, 'HABIT_DB_SHARDS', [])
+
+
+def shard_for(user_id):
+    aliases = shards()
+    if not aliases:
+        return 'default'
+    return aliases[int(user_id) % len(aliases)]
+
+
+# 사용자의 참여 기록은 항상 이 함수로 조회함
+# 샤드에는 챌린지 테이블이 없어서 JOIN 대신 prefetch 로 챌린지를 불러옴
+def participants_for(user_id, with_challenge=False):
+    from .models import ChallengeParticipant
+
+    db = shard_for(user_id)
+    queryset = ChallengeParticipant.objects.using(db).filter(user_id=user_id)
+    if with_challenge:
+        queryset = queryset.prefetch_related('challenge') if db in shards() else queryset.select_related('challenge')
+    return queryset
+
+
+# 샤드 전체를 훑어야 하는 집계/관리 작업용 (샤드가 없으면 default 하나)
+def each_shard():
+    return shards() or ['default']
+
+
+@contextmanager
+def pin_primary():
+    token = _state.set(RoutingState(pinned=True))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+def _is_sharded(model):
+    return bool(shards()) and model._meta.app_label == 'habit_stacker' and model._meta.model_name in SHARDED_MODELS
+
+
+def _shard_from_hints(hints):
+    from .models import ChallengeParticipant, CheckIn, ParticipationArchive
+
+    instance = hints.get('instance')
+    if isinstance(instance, (ChallengeParticipant, ParticipationArchive)):
+        return shard_for(instance.user_id)
+    if isinstance(instance, CheckIn):
+        if instance._state.db:
+            return instance._state.db
+        if instance.participant_id is not None and 'participant' in instance._state.fields_cache:
+            return shard_for(instance.participant.user_id)
+    return None
+
+
+def _route_sharded(model, hints):
+    if not _is_sharded(model):
+        return None
+    db = _shard_from_hints(hints)
+    # 마이그레이션의 과거 모델(RunPython)은 마이그레이션 중인 DB를 그대로 씀
+    if db is None and model.__module__ != '__fake__':
+        raise ShardRoutingError(
+            f'{model._meta.label} 는 샤드에 나뉘어 있습니다. participants_for() 나 each_shard() 와 .using() 으로 조회하세요.'
+        )
+    return db
+
+
+class ParticipantShardRouter:
+    def db_for_read(self, model, **hints):
+        return _route_sharded(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return _route_sharded(model, hints)
+
+    # 샤드의 참여 기록도 default 의 User/Challenge 를 가리킬 수 있어야 함
+    def allow_relation(self, obj1, obj2, **hints):
+        if shards() and (_is_sharded(type(obj1)) or _is_sharded(type(obj2))):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in shards():
+            return app_label == 'habit_stacker' and model_name in SHARDED_MODELS
+        return None
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        aliases = replicas()
+        state = _state.get()
+        if not aliases or state is None or state.pinned or state.wrote:
+            return 'default'
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        family = {'default', *replicas()}
+        if obj1._state.db in family and obj2._state.db in family:
+            return True
+        return None
+
+    # 복제본은 default 를 그대로 복사하므로 따로 마이그레이션하지 않음
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replicas():
+            return False
+        return None
+
+
+# POST 등 쓰기 요청과, 최근에 쓴 사용자의 요청은 default 에서만 읽게 함
+# MetricsMiddleware 와 마찬가지로 async 뷰 앞에서 스레드를 오가지 않도록 동기/비동기 둘 다 지원함
+class PinnedPrimaryMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'HABIT_DB_STICKY_SECONDS', 5)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _pinned(self, request):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return True
+        try:
+            return float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def _stick(self, state, response):
+        if state.wrote:
+            response.set_cookie(
+                STICKY_COOKIE, str(time.time() + self.sticky_seconds),
+                max_age=self.sticky_seconds, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState(pinned=self._pinned(request))
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self._stick(state, response)
+
+    # sync_to_async 로 실행되는 ORM 호출도 같은 RoutingState 객체를 보므로 쓰기 여부가 여기까지 전달됨
+    async def __acall__(self, request):
+        state = RoutingState(pinned=self._pinned(request))
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self._stick(state, response)
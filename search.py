@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from .models import Challenge
+
+# 챌린지 제목/설명 전문 검색
+# 인덱스는 DB 안에서 유지됨: SQLite 는 FTS5 테이블 + 트리거, PostgreSQL 은 tsvector GIN 인덱스
+# (migrations/0008_challenge_search_index.py), 그래서 save/delete 뿐 아니라 bulk_create 도 바로 반영됨
+
+CHALLENGE_TABLE = Challenge._meta.db_table
+FTS_TABLE = f'{CHALLENGE_TABLE}_fts'
+PG_DOCUMENT = "to_tsvector('simple', {alias}title || ' ' || {alias}description)"
+
+
+class SearchBackend:
+    def _filters(self, category, duration):
+        sql, params = [], []
+        if category:
+            sql.append('c.category = %s')
+            params.append(category)
+        if duration:
+            sql.append('c.duration = %s')
+            params.append(duration)
+        return ''.join(f' AND {clause}' for clause in sql), params
+
+    def _fetch(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def search(self, query, category=None, duration=None, limit=20):
+        """(챌린지, 점수) 목록을 관련도 순으로 반환"""
+        match_sql, match_params = self.match(query)
+        filter_sql, filter_params = self._filters(category, duration)
+        rows = self._fetch(
+            f'{match_sql}{filter_sql} ORDER BY rank LIMIT %s',
+            [*match_params, *filter_params, limit],
+        )
+        challenges = Challenge.objects.in_bulk([pk for pk, _ in rows])
+        return [(challenges[pk], rank) for pk, rank in rows if pk in challenges]
+
+    # 흔한 단어는 일치하는 행이 아주 많으므로 전체를 세지 않고, 두 패싯을 GROUP BY 한 번으로 같이 셈
+    def facets(self, query, limit=None):
+        """관련도 상위 limit 개 결과의 카테고리/기간별 개수"""
+        if limit is None:
+            limit = getattr(settings, 'HABIT_SEARCH_FACET_LIMIT', 1000)
+        match_sql, params = self.match(query)
+        facets = {'category': {}, 'duration': {}}
+        rows = self._fetch(
+            f'SELECT c.category, c.duration, COUNT(*) FROM ({match_sql} ORDER BY rank LIMIT %s) m '
+            f'JOIN {CHALLENGE_TABLE} c ON c.id = m.id GROUP BY c.category, c.duration',
+            [*params, limit],
+        )
+        for category, duration, count in rows:
+            facets['category'][category] = facets['category'].get(category, 0) + count
+            facets['duration'][duration] = facets['duration'].get(duration, 0) + count
+        return facets
+
+    def match(self, query):
+        """검색어에 맞는 (id, rank) 를 고르는 SELECT 문과 파라미터 (rank 는 작을수록 관련도 높음)"""
+        raise NotImplementedError
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    def match(self, query):
+        # 사용자가 입력한 FTS5 문법은 쓰지 않고 단어마다 접두어 검색으로 바꿈
+        terms = ' '.join('"{}"*'.format(word.replace('"', '""')) for word in query.split())
+        return (
+            f'SELECT c.id AS id, bm25({FTS_TABLE}, 10.0, 1.0) AS rank FROM {FTS_TABLE} '
+            f'JOIN {CHALLENGE_TABLE} c ON c.id = {FTS_TABLE}.rowid WHERE {FTS_TABLE} MATCH %s',
+            [terms],
+        )
+
+
+class PostgresSearchBackend(SearchBackend):
+    def match(self, query):
+        # 인덱스 식과 같은 to_tsvector(...) 를 써야 GIN 인덱스를 탐
+        document = PG_DOCUMENT.format(alias='c.')
+        return (
+            f"SELECT c.id AS id, -ts_rank({document}, q) AS rank "
+            f"FROM {CHALLENGE_TABLE} c, websearch_to_tsquery('simple', %s) q WHERE {document} @@ q",
+            [query],
+        )
+
+
+BACKENDS = {
+    'sqlite': SQLiteFTS5Backend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_backend():
+    path = getattr(settings, 'HABIT_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    return BACKENDS[connection.vendor]()
@@ -46,15 +46,38 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'habit_stacker.metrics.MetricsMiddleware',
+    'habit_stacker.routers.PinnedPrimaryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'habit_stacker.authcache.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# 요청별 SQL/템플릿/전체 지연시간 기록 (metrics.MetricsMiddleware, /metrics/)
+# 끄면 미들웨어가 빠져서 오버헤드가 없음, SAMPLE_RATE 로 일부 요청만 기록할 수 있음
+HABIT_METRICS_ENABLED = True
+HABIT_METRICS_SAMPLE_RATE = 1.0
+HABIT_METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+HABIT_SLOW_REQUEST_MS = 500
+
+# 워커(프로세스)끼리 공유해야 하는 캐시('shared')의 Redis 주소
+# 없으면 'shared' 는 한 프로세스 안에서만 맞는 LocMemCache 가 됨 (runserver/테스트용, 배포 시 check --deploy 에서 경고)
+HABIT_REDIS_URL = os.environ.get("HABIT_REDIS_URL")
+
+# Redis 가 있으면 세션은 캐시에서 먼저 읽고(DB는 쓰기/캐시 미스 때만), 로그인한 사용자 객체도 잠깐 캐시함
+# 로그아웃/비밀번호 변경이 다른 워커에도 바로 반영되어야 하므로 공유 캐시가 없으면 둘 다 DB 에서 읽음
+if HABIT_REDIS_URL:
+    SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+    SESSION_CACHE_ALIAS = "shared"
+    HABIT_USER_CACHE_TIMEOUT = 60
+else:
+    SESSION_ENGINE = "django.contrib.sessions.backends.db"
+    HABIT_USER_CACHE_TIMEOUT = 0
+
 ROOT_URLCONF = "habit_stacker.urls"
 
 TEMPLATES = [
@@ -76,12 +99,21 @@ TEMPLATES = [
 # WSGI_APPLICATION = "habit_stacker.wsgi.application"
 ASGI_APPLICATION = "habit_stacker.asgi.application"
 
+# 메인/상세 페이지에 async 뷰(views.amain_page, views.asingle_challenge_page)를 사용
+HABIT_ASYNC_VIEWS = True
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels.layers.InMemoryChannelLayer"
     }
 }
 
+# 웹소켓으로 보내는 참여/체크인 이벤트를 모아두는 시간(초)
+HABIT_EVENT_FLUSH_INTERVAL = 0.25
+
+# 검색 패싯(카테고리/기간별 개수)은 관련도 상위 N 개 결과 안에서만 셈
+HABIT_SEARCH_FACET_LIMIT = 1000
+
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
@@ -89,9 +121,129 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # 트랜잭션을 시작할 때 바로 쓰기 잠금을 잡음 (BEGIN IMMEDIATE)
+        # 읽다가 쓰기로 올라가는 DEFERRED 트랜잭션은 WAL 에서 busy timeout 없이 바로 'database is locked' 가 남
+        "OPTIONS": {"transaction_mode": "IMMEDIATE"},
+        # 테스트도 파일 DB 로 돌려야 여러 스레드가 실제와 같은 잠금으로 동시에 씀 (tests.py 의 동시 참여 테스트)
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
+        # CONN_MAX_AGE 는 두지 않음: ASGI 에서는 요청마다 sync 코드가 새 스레드에서 돌아서
+        # 유지된 연결이 재사용되지 않고 쌓임 (SQLite 는 연결을 여는 비용도 작음)
     }
 }
 
+# 읽기 복제본과 참여 기록 샤드 (routers.py)
+# 로컬에서는 HABIT_DB_REPLICAS=2 처럼 개수만 주면 같은 SQLite 파일을 읽는 복제본 별칭이 생기고,
+# HABIT_DB_SHARDS=2 면 ChallengeParticipant/CheckIn 을 db_shard0.sqlite3, db_shard1.sqlite3 에 나눠 저장함
+# (샤드는 manage.py migrate --database shard0 처럼 따로 마이그레이션해야 함)
+HABIT_DB_REPLICAS = []
+for _i in range(int(os.environ.get("HABIT_DB_REPLICAS", 0))):
+    DATABASES[f"replica{_i}"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+    HABIT_DB_REPLICAS.append(f"replica{_i}")
+
+HABIT_DB_SHARDS = []
+for _i in range(int(os.environ.get("HABIT_DB_SHARDS", 0))):
+    DATABASES[f"shard{_i}"] = {
+        **DATABASES["default"],
+        "NAME": BASE_DIR / f"db_shard{_i}.sqlite3",
+        "TEST": {"NAME": BASE_DIR / f"test_db_shard{_i}.sqlite3"},
+    }
+    HABIT_DB_SHARDS.append(f"shard{_i}")
+
+DATABASE_ROUTERS = [
+    "habit_stacker.routers.ParticipantShardRouter",
+    "habit_stacker.routers.PrimaryReplicaRouter",
+]
+
+# 쓰기 후 이 시간(초) 동안은 그 사용자의 읽기를 default 로 보냄 (복제 지연 대비)
+HABIT_DB_STICKY_SECONDS = 5
+
+# 작업 큐 (jobs.py, manage.py run_jobs)
+# 실패하면 RETRY_BASE * 2^(시도-1) 초 (최대 RETRY_MAX) 뒤에 다시 시도, LOCK_TIMEOUT 동안 끝나지 않은 작업은 다시 대기열로 돌림
+HABIT_JOB_RETRY_BASE = 10
+HABIT_JOB_RETRY_MAX = 60 * 60
+HABIT_JOB_LOCK_TIMEOUT = 15 * 60
+# 실행 중인 작업의 locked_at 을 갱신하는 간격(초), LOCK_TIMEOUT 보다 충분히 짧아야 함
+HABIT_JOB_HEARTBEAT = 60
+# 끝난(DONE) 작업은 이 일수가 지나면 purge_finished_jobs 가 지움
+HABIT_JOB_RETENTION_DAYS = 7
+# 워커가 주기적으로 넣는 작업 {작업 이름: 간격(초)}
+HABIT_PERIODIC_JOBS = {
+    "refresh_leaderboards": 5 * 60,
+    "rebuild_leaderboards": 24 * 60 * 60,
+    "rebuild_recommendations": 60 * 60,
+    "schedule_daily_reminders": 24 * 60 * 60,
+    "archive_participations": 24 * 60 * 60,
+    "purge_finished_jobs": 24 * 60 * 60,
+}
+# 리마인더 작업 하나가 처리할 참가자 수
+HABIT_REMINDER_CHUNK = 2000
+
+# 끝난 지 이 일수가 지난 챌린지의 참여 기록을 보관 테이블로 옮김 (archive.py)
+HABIT_ARCHIVE_AFTER_DAYS = 30
+
+# 개발 환경에서는 메일을 콘솔에 출력
+EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+DEFAULT_FROM_EMAIL = "habit_stacker <noreply@habit-stacker.local>"
+
+# SQLite 연결마다 적용할 PRAGMA (signals.configure_sqlite)
+# WAL 모드에서는 쓰기가 읽기를 막지 않고, busy_timeout 동안은 "database is locked" 대신 기다림
+HABIT_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 20000,
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "cache_size": -20000,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "habit-stacker",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    # 렌더링된 페이지 조각 캐시 (LocMemCache 는 가득 차면 가장 오래 안 쓴 항목부터 지움)
+    "fragments": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "habit-stacker-fragments",
+        "TIMEOUT": 60 * 60 * 24,
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
+    # 워커끼리 공유해야 하는 값: 세션, 로그인한 사용자 객체(authcache.py), 페이지 조각 버전 스탬프(fragments.py),
+    # 사용자별 참여 챌린지 id 집합(participation.py)
+    "shared": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": HABIT_REDIS_URL,
+    } if HABIT_REDIS_URL else {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "habit-stacker-shared",
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
+    # 로그인/회원가입 요청 제한 토큰 버킷 (ratelimit.py)
+    "ratelimit": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "habit-stacker-ratelimit",
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
+}
+
+HABIT_FRAGMENT_CACHE = True
+
+
+# 로그인/회원가입의 bcrypt 계산을 hashing.py 의 프로세스 풀에서 함
+# 예전 PBKDF2 해시는 로그인할 때 새 형식으로 다시 저장됨
+PASSWORD_HASHERS = [
+    "habit_stacker.hashing.PooledBCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -111,6 +263,19 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# bcrypt 작업 비용(cost)과 해시 계산용 프로세스 풀 크기 (None 이면 CPU 수, 0 이면 풀을 쓰지 않음)
+HABIT_BCRYPT_ROUNDS = 12
+HABIT_BCRYPT_POOL_SIZE = None
+
+# 로그인/회원가입 요청 제한: 이름: (버킷 크기, 가득 차는 데 걸리는 초)
+HABIT_RATE_LIMIT_ENABLED = True
+HABIT_RATE_LIMITS = {
+    "login_ip": (20, 60),
+    "login_email": (5, 300),
+    "signup_ip": (5, 3600),
+    "signup_email": (3, 3600),
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -133,6 +298,21 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static/'),
 ]
 
+# manage.py build_static (collectstatic) 결과물: 해시가 붙은 파일 + .gz/.br 압축본 + manifest
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "habit_stacker.staticassets.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# wsgi.py / asgi.py 에서 STATIC_ROOT 의 파일을 장고를 거치지 않고 바로 보냄 (staticassets.py)
+HABIT_STATIC_SERVE = True
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_out
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .authcache import invalidate_user
+from .fragments import bump_challenge_version
+from .metrics import install_query_timer
+from .models import Challenge, ChallengeParticipant, ParticipationArchive
+from .participation import invalidate_joined
+from .routers import shards
+
+
+# 커밋 전에 지우면 그 사이 캐시 미스가 커밋 전 참여 목록을 다시 넣으므로 커밋된 뒤에 지움
+@receiver([post_save, post_delete], sender=ChallengeParticipant)
+def participant_changed(sender, instance, using, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_joined(user_id), using=using)
+
+
+# 샤드의 참여/보관 기록은 default 에서 지우는 Collector 가 보지 못하고, 샤드에는 외래키 제약도 없으므로
+# 사용자/챌린지를 지울 때 샤드마다 직접 지움 (체크인은 샤드 안에서 참여 기록과 함께 지워짐)
+@receiver(pre_delete, sender=User)
+def delete_user_shard_rows(sender, instance, **kwargs):
+    for db in shards():
+        ChallengeParticipant.objects.using(db).filter(user_id=instance.pk).delete()
+        ParticipationArchive.objects.using(db).filter(user_id=instance.pk).delete()
+
+
+@receiver(pre_delete, sender=Challenge)
+def delete_challenge_shard_rows(sender, instance, **kwargs):
+    for db in shards():
+        ChallengeParticipant.objects.using(db).filter(challenge_id=instance.pk).delete()
+
+
+@receiver([post_save, post_delete], sender=Challenge)
+def challenge_changed(sender, instance, **kwargs):
+    bump_challenge_version(instance.pk)
+
+
+# SQLite 연결이 새로 열릴 때마다 WAL, busy timeout 등 PRAGMA 를 적용 (settings.HABIT_SQLITE_PRAGMAS)
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'HABIT_SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+# 요청별 SQL 개수/시간 기록 (metrics.MetricsMiddleware), 켜져 있을 때만 연결마다 한 번 걸어둠
+@receiver(connection_created)
+def time_queries(sender, connection, **kwargs):
+    if getattr(settings, 'HABIT_METRICS_ENABLED', False):
+        install_query_timer(connection)
+
+
+# 비밀번호 변경 등으로 사용자가 저장되거나 로그아웃하면 캐시된 사용자 객체를 지움
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def user_logged_out_handler(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_user(user.pk)
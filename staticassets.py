@@ -0,0 +1,235 @@
+import asyncio
+import gzip
+import mimetypes
+import os
+from pathlib import Path
+from wsgiref.util import FileWrapper
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 정적 파일 빌드/서빙
+# - collectstatic(build_static) 때 파일 이름에 해시를 붙이고(manifest), 압축할 만한 파일은 .gz/.br 도 같이 만들어 둠
+# - 서버가 뜰 때 STATIC_ROOT 를 한 번 훑어서 경로 -> 파일 정보 색인을 메모리에 올리고,
+#   요청마다 stat/파일 탐색 없이 Accept-Encoding 에 맞는 미리 압축된 파일을 보냄
+# - 해시가 붙은 파일은 내용이 바뀌면 이름도 바뀌므로 1년 immutable 캐시
+
+# 이미 압축된 형식은 다시 압축하지 않음
+SKIP_COMPRESS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.ico', '.woff', '.woff2',
+    '.zip', '.gz', '.br', '.mp4', '.webm', '.mp3',
+}
+COMPRESS_MIN_SIZE = 512
+IMMUTABLE = 'public, max-age=31536000, immutable'
+MUTABLE = 'public, max-age=60'
+CHUNK_SIZE = 64 * 1024
+
+
+def compress_file(path):
+    path = Path(path)
+    if path.suffix.lower() in SKIP_COMPRESS or path.stat().st_size < COMPRESS_MIN_SIZE:
+        return []
+    data = path.read_bytes()
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+
+    written = []
+    for suffix, content in variants:
+        # 압축해도 별로 줄지 않으면 원본만 보냄
+        if len(content) < len(data) * 0.95:
+            Path(f'{path}{suffix}').write_bytes(content)
+            written.append(f'{path.name}{suffix}')
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        # 원본 이름과 해시 이름 모두 압축본을 만듦 (manifest 는 super() 에서 이미 저장됨)
+        for name in [*paths, *self.hashed_files.values()]:
+            if self.exists(name):
+                compress_file(self.path(name))
+
+
+class StaticEntry:
+    def __init__(self, path, immutable):
+        stat = os.stat(path)
+        self.path = path
+        self.size = stat.st_size
+        self.mtime = int(stat.st_mtime)
+        self.last_modified = http_date(self.mtime)
+        self.etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type in ('application/javascript', 'application/json'):
+            self.content_type += '; charset=utf-8'
+        self.cache_control = IMMUTABLE if immutable else MUTABLE
+        self.variants = {}
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if os.path.exists(path + suffix):
+                self.variants[encoding] = (path + suffix, os.path.getsize(path + suffix))
+
+    def select(self, accept_encoding):
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding, (path, size) in self.variants.items():
+            if encoding in accepted:
+                return encoding, path, size
+        return None, self.path, self.size
+
+    def headers(self, encoding, size):
+        headers = [
+            ('Content-Type', self.content_type),
+            ('Content-Length', str(size)),
+            ('Last-Modified', self.last_modified),
+            ('ETag', self.etag[:-1] + f'-{encoding}"' if encoding else self.etag),
+            ('Cache-Control', self.cache_control),
+        ]
+        if self.variants:
+            headers.append(('Vary', 'Accept-Encoding'))
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        return headers
+
+
+def parse_accept_encoding(value):
+    accepted = set()
+    for part in value.split(','):
+        name, _, params = part.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+# STATIC_ROOT 아래 파일 색인, 압축본(.gz/.br)은 원본 항목의 variants 로만 들어감
+class StaticIndex:
+    def __init__(self, root=None, prefix=None):
+        self.root = str(root or getattr(settings, 'STATIC_ROOT', None) or '')
+        self.prefix = '/' + (prefix or settings.STATIC_URL).strip('/') + '/'
+        self.entries = {}
+        if self.root and os.path.isdir(self.root):
+            self._scan()
+
+    def _hashed_names(self):
+        storage = ManifestStaticFilesStorage(location=self.root)
+        try:
+            return set(storage.load_manifest().values())
+        except ValueError:
+            return set()
+
+    def _scan(self):
+        hashed = self._hashed_names()
+        for directory, _, files in os.walk(self.root):
+            for filename in files:
+                if filename.endswith(('.gz', '.br')) and os.path.exists(os.path.join(directory, filename[:-3])):
+                    continue
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, self.root).replace(os.sep, '/')
+                self.entries[self.prefix + name] = StaticEntry(path, name in hashed)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, path):
+        if not path.startswith(self.prefix):
+            return None
+        return self.entries.get(path)
+
+
+# 압축본의 ETag("...-gzip") 와 약한 비교(W/)도 원본 ETag 와 같은 것으로 봄
+def _base_etag(tag):
+    tag = tag.removeprefix('W/')
+    for suffix in ('-gzip"', '-br"'):
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+
+# If-None-Match 가 있으면 If-Modified-Since 는 보지 않음 (RFC 9110 13.1.3)
+def _not_modified(entry, if_none_match, if_modified_since=None):
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return etags == ['*'] or any(_base_etag(tag) == entry.etag for tag in etags)
+    if if_modified_since:
+        since = parse_http_date_safe(if_modified_since)
+        return since is not None and entry.mtime <= since
+    return False
+
+
+# WSGI: 서버가 wsgi.file_wrapper 를 주면(gunicorn 등) sendfile 로 보냄
+class StaticFilesWSGI:
+    def __init__(self, application, index=None):
+        self.application = application
+        self.index = index or StaticIndex()
+
+    def __call__(self, environ, start_response):
+        entry = self.index.lookup(environ.get('PATH_INFO', ''))
+        method = environ.get('REQUEST_METHOD')
+        if entry is None or method not in ('GET', 'HEAD'):
+            return self.application(environ, start_response)
+
+        encoding, path, size = entry.select(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        headers = entry.headers(encoding, size)
+        if _not_modified(entry, environ.get('HTTP_IF_NONE_MATCH'), environ.get('HTTP_IF_MODIFIED_SINCE')):
+            start_response('304 Not Modified', [h for h in headers if h[0] not in ('Content-Length', 'Content-Type')])
+            return []
+        start_response('200 OK', headers)
+        if method == 'HEAD':
+            return []
+        file_wrapper = environ.get('wsgi.file_wrapper', FileWrapper)
+        return file_wrapper(open(path, 'rb'), CHUNK_SIZE)
+
+
+# ASGI: 서버가 지원하면 zerocopysend(파일 디스크립터) 나 pathsend(경로) 확장으로 보내고, 아니면 조각으로 읽어서 보냄
+class StaticFilesASGI:
+    def __init__(self, application, index=None):
+        self.application = application
+        self.index = index or StaticIndex()
+
+    async def __call__(self, scope, receive, send):
+        entry = self.index.lookup(scope['path']) if scope['type'] == 'http' else None
+        if entry is None or scope['method'] not in ('GET', 'HEAD'):
+            return await self.application(scope, receive, send)
+
+        request_headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+        encoding, path, size = entry.select(request_headers.get('accept-encoding', ''))
+        headers = entry.headers(encoding, size)
+        if _not_modified(entry, request_headers.get('if-none-match'), request_headers.get('if-modified-since')):
+            status = 304
+            headers = [h for h in headers if h[0] not in ('Content-Length', 'Content-Type')]
+        else:
+            status = 200
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+        })
+        if status == 304 or scope['method'] == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        extensions = scope.get('extensions') or {}
+        if 'http.response.zerocopysend' in extensions:
+            with open(path, 'rb') as f:
+                await send({'type': 'http.response.zerocopysend', 'file': f})
+            return
+        if 'http.response.pathsend' in extensions:
+            await send({'type': 'http.response.pathsend', 'path': path})
+            return
+
+        with open(path, 'rb') as f:
+            while True:
+                chunk = await asyncio.to_thread(f.read, CHUNK_SIZE)
+                more = len(chunk) == CHUNK_SIZE
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': more})
+                if not more:
+                    break
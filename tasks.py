@@ -0,0 +1,44 @@
+from . import archive, jobs, leaderboards, recommendations, reminders
+
+# 작업 큐(jobs.py)에서 실행할 작업 목록, apps.ready 에서 불러와 등록함
+
+
+@jobs.register('refresh_leaderboards')
+def refresh_leaderboards(full=False):
+    leaderboards.refresh(full=full)
+
+
+# 탈퇴/인증 취소로 줄어든 값까지 맞추는 전체 다시 계산
+@jobs.register('rebuild_leaderboards')
+def rebuild_leaderboards():
+    leaderboards.refresh(full=True)
+
+
+@jobs.register('rebuild_recommendations')
+def rebuild_recommendations(incremental=True):
+    recommendations.rebuild(incremental=incremental)
+
+
+@jobs.register('schedule_daily_reminders')
+def schedule_daily_reminders(date=None):
+    reminders.schedule_daily_reminders(date)
+
+
+@jobs.register('send_reminder_chunk')
+def send_reminder_chunk(date, db, after):
+    reminders.send_reminder_chunk(date, db, after)
+
+
+@jobs.register('send_join_confirmation')
+def send_join_confirmation(user_id, challenge_id):
+    reminders.send_join_confirmation(user_id, challenge_id)
+
+
+@jobs.register('archive_participations')
+def archive_participations():
+    archive.archive_finished()
+
+
+@jobs.register('purge_finished_jobs')
+def purge_finished_jobs(days=None):
+    jobs.purge_finished(days)
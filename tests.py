@@ -0,0 +1,158 @@
+import threading
+from datetime import timedelta
+from unittest import skipIf
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+
+from .checkins import check_in, checked_days, current_streak, is_complete, longest_streak
+from .models import Challenge
+from .pagination import CursorPaginator, InvalidCursor, cursor_query_prefix
+from .participation import join_challenge
+from .routers import participants_for
+
+
+def make_challenge(**fields):
+    fields.setdefault('category', 'Health')
+    fields.setdefault('title', 'Drink water')
+    fields.setdefault('description', 'Eight glasses a day.')
+    return Challenge.objects.create(**fields)
+
+
+# 체크인 비트맵: i번 비트 = 참여 i일째 체크인 여부
+class StreakMathTests(SimpleTestCase):
+    def test_checked_days_ignores_bits_past_duration(self):
+        self.assertEqual(checked_days(0b1_0000_0111, 7), 3)
+
+    def test_current_streak_counts_back_from_today(self):
+        self.assertEqual(current_streak(0b111_0111, 6), 3)
+
+    def test_current_streak_starts_yesterday_when_today_is_unchecked(self):
+        self.assertEqual(current_streak(0b011_0111, 6), 2)
+        self.assertEqual(current_streak(0b011_0111, 7), 0)
+
+    def test_current_streak_is_zero_without_checkins(self):
+        self.assertEqual(current_streak(0, 0), 0)
+        self.assertEqual(current_streak(0, 5), 0)
+        self.assertEqual(current_streak(0b10, 0), 0)
+
+    def test_longest_streak(self):
+        self.assertEqual(longest_streak(0), 0)
+        self.assertEqual(longest_streak(0b1011), 2)
+        self.assertEqual(longest_streak(0b1110_1111_0011), 4)
+
+    def test_is_complete(self):
+        self.assertTrue(is_complete(0b111_1111, 7))
+        self.assertTrue(is_complete(0b1111_1111, 7))
+        self.assertFalse(is_complete(0b111_1101, 7))
+
+
+class CursorPaginatorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.challenges = [make_challenge(title=f'Challenge {i}') for i in range(5)]
+        self.newest_first = [challenge.pk for challenge in reversed(self.challenges)]
+
+    def pks(self, page):
+        return [challenge.pk for challenge in page]
+
+    def test_walks_forward_and_back(self):
+        paginator = CursorPaginator(Challenge.objects.all(), 2)
+        first = paginator.page()
+        self.assertEqual(self.pks(first), self.newest_first[:2])
+        self.assertFalse(first.has_previous())
+
+        second = paginator.page(first.next_cursor)
+        self.assertEqual(self.pks(second), self.newest_first[2:4])
+
+        last = paginator.page(second.next_cursor)
+        self.assertEqual(self.pks(last), self.newest_first[4:])
+        self.assertFalse(last.has_next())
+
+        back = paginator.page(last.previous_cursor)
+        self.assertEqual(self.pks(back), self.newest_first[2:4])
+        self.assertTrue(back.has_next())
+        self.assertTrue(back.has_previous())
+
+    def test_ascending(self):
+        paginator = CursorPaginator(Challenge.objects.all(), 3, descending=False)
+        first = paginator.page()
+        self.assertEqual(self.pks(first), self.newest_first[::-1][:3])
+        self.assertEqual(self.pks(paginator.page(first.next_cursor)), self.newest_first[::-1][3:])
+
+    def test_invalid_cursor(self):
+        paginator = CursorPaginator(Challenge.objects.all(), 2)
+        for cursor in ('not-a-cursor', 'WyJ4IiwxXQ'):
+            with self.assertRaises(InvalidCursor):
+                paginator.page(cursor)
+
+    def test_count_is_cached_per_filter(self):
+        make_challenge(category='Hobby')
+        self.assertEqual(CursorPaginator(Challenge.objects.all(), 2).count, 6)
+        self.assertEqual(CursorPaginator(Challenge.objects.filter(category='Hobby'), 2).count, 1)
+        self.assertEqual(CursorPaginator(Challenge.objects.none(), 2).count, 0)
+
+    def test_cursor_query_prefix_keeps_filters(self):
+        self.assertEqual(cursor_query_prefix(QueryDict('category=Health&cursor=abc&page=2')), 'category=Health&')
+        self.assertEqual(cursor_query_prefix(QueryDict('cursor=abc')), '')
+
+
+# 체크인은 챌린지 기간 안에서만, 시작 전에 참여했다면 시작한 날이 0일째
+class CheckInWindowTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='walker', email='walker@example.com')
+
+    def test_rejects_check_in_after_challenge_ends(self):
+        challenge = make_challenge(starts_at=timezone.now() - timedelta(days=10))
+        participant, _ = join_challenge(self.user, challenge)
+        with self.assertRaises(ValidationError):
+            check_in(participant)
+
+    def test_days_count_from_start_when_joined_early(self):
+        challenge = make_challenge(starts_at=timezone.now() + timedelta(days=2))
+        participant, _ = join_challenge(self.user, challenge)
+        with self.assertRaises(ValidationError):
+            check_in(participant)
+        self.assertTrue(check_in(participant, when=challenge.starts_at + timedelta(minutes=1)))
+        self.assertEqual(participant.checkin_bits, 1)
+
+
+# 같은 (사용자, 챌린지) 로 동시에 참여해도 참여 행과 카운터는 하나씩만 늘어야 함
+# 메모리 DB 는 스레드끼리 잠금이 실제와 다르므로 파일 테스트 DB(settings 의 TEST NAME)에서만 돌림
+@skipIf(connection.vendor == 'sqlite' and connection.is_in_memory_db(), 'needs a file-backed test database')
+class ConcurrentJoinTests(TransactionTestCase):
+    THREADS = 8
+
+    def test_parallel_joins_create_one_participant(self):
+        user = User.objects.create(username='racer', email='racer@example.com')
+        challenge = make_challenge()
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+        created = []
+
+        def join():
+            try:
+                barrier.wait()
+                _, was_created = join_challenge(user, Challenge.objects.get(pk=challenge.pk))
+                created.append(was_created)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=join) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(created.count(True), 1)
+        self.assertEqual(participants_for(user.pk).filter(challenge=challenge).count(), 1)
+        challenge.refresh_from_db()
+        self.assertEqual(challenge.participant_count, 1)
@@ -14,21 +14,38 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from . import views
+from . import api, views
+from .metrics import metrics_view
+
+# ASGI(daphne)로 돌릴 때는 읽기 위주 페이지에 async 뷰를 사용
+if getattr(settings, 'HABIT_ASYNC_VIEWS', False):
+    main_page_view = views.amain_page
+    single_challenge_page_view = views.asingle_challenge_page
+else:
+    main_page_view = views.main_page
+    single_challenge_page_view = views.single_challenge_page
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path('', views.main_page, name='main_page'),
+    path('', main_page_view, name='main_page'),
     # path('account/', include('django.contrib.auth.urls')),
     # path('account/', include('account.urls')),
     # path('', views.ChallengeList.as_view(), name='challenge_list'),
-    path('<int:pk>/', views.single_challenge_page, name='single_challenge_page'),
-    # path('<int:pk>/joined_challenge/', views.joined_challenge_page, name='joined_challenge'),
+    path('<int:pk>/', single_challenge_page_view, name='single_challenge_page'),
+    path('<int:pk>/joined_challenge/', views.joined_challenge_page, name='joined_challenge'),
+    path('<int:pk>/check_in/', views.check_in_page, name='check_in'),
+    path('dashboard/', views.dashboard_page, name='dashboard'),
+    path('leaderboard/', views.leaderboard_page, name='leaderboard'),
+    path('search/', views.search_page, name='search'),
+    path('api/challenges/', api.challenge_list, name='api_challenge_list'),
+    path('api/challenges/<int:pk>/', api.challenge_detail, name='api_challenge_detail'),
     path('challenge_form/', views.create_challenge, name='challenge_form'),
     path('signup/', views.signup, name='signup'),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout, name='logout'),
+    path('metrics/', metrics_view, name='metrics'),
 ]
 
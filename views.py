@@ -6,27 +6,49 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth import logout as auth_logout, login as auth_login
+from django.core.exceptions import ValidationError
 from django.db import IntegrityError
+from django.http import Http404, JsonResponse
 from django.views.decorators.csrf import csrf_protect
 
+from .archive import user_participations
 from .models import Challenge, ChallengeParticipant, User
+from .checkins import check_in, progress
 from .forms import SignUpForm, LoginForm, ChallengeForm
+from . import fragments, leaderboards, ratelimit
+from .pagination import CursorPaginationMixin, CursorPaginator, InvalidCursor, cursor_query_prefix
+from .participation import ahas_joined, has_joined, join_challenge
+from .routers import participants_for
+from .search import get_backend as get_search_backend
 
 def single_challenge_page(request, pk):
-    challenge = Challenge.objects.get(pk=pk)
+    # 참여 여부는 캐시된 id 집합으로 확인 -> 이미 참여했다면 챌린지 조회 없이 바로 이동
+    if request.user.is_authenticated and has_joined(request.user, pk):
+        return redirect('joined_challenge', pk=pk)
 
-    if request.user.is_authenticated:
-        if ChallengeParticipant.objects.filter(user=request.user, challenge=challenge).exists():
-            return redirect('joined_challenge', pk=pk)
- 
+    # 익명 사용자는 pk + 버전으로 캐시된 페이지를 그대로 돌려줌
+    cacheable = fragments.is_cacheable(request)
+    if cacheable:
+        key = fragments.challenge_page_key(pk)
+        response = fragments.cached_response(key)
+        if response is not None:
+            return response
 
-    return render(
+    challenge = Challenge.objects.get(pk=pk)
+    # 미리 계산해둔 추천을 (challenge, rank) 인덱스로 한 번에 읽음
+    recommendations = challenge.recommendations.select_related('recommended').order_by('rank')
+
+    response = render(
         request,
         'habit_stacker/single_challenge_page.html',
         {
             'challenge': challenge,
+            'recommendations': list(recommendations),
         }
     )
+    if cacheable:
+        fragments.store_response(request, key, response)
+    return response
 
 @csrf_protect
 @login_required
@@ -47,8 +69,7 @@ def joined_challenge_page(request, pk):
     if not request.user.is_authenticated:
         return redirect('login')
     challenge = Challenge.objects.get(pk=pk)
-    ChallengeParticipant.objects.create(user=request.user, challenge=challenge)
-    #join_challenge(request, pk)
+    join_challenge(request.user, challenge) # 이미 참여한 경우 새로 만들지 않음
     return render(
         request, 
         'habit_stacker/joined_challenge.html',
@@ -57,16 +78,184 @@ def joined_challenge_page(request, pk):
         }
     )
 
+@login_required
+def check_in_page(request, pk):
+    if request.method == 'POST':
+        participant = get_object_or_404(participants_for(request.user.pk, with_challenge=True), challenge_id=pk)
+        try:
+            if check_in(participant):
+                messages.success(request, '오늘 체크인을 완료했습니다.')
+        except ValidationError as e:
+            messages.error(request, e.messages[0])
+    return redirect('joined_challenge', pk=pk)
+
+# 사용자의 참여 기록(보관된 기록 포함)을 한 번에 불러와서 진행 상황을 비트맵으로 계산
+# 진행 중인 챌린지는 위에, 끝난 챌린지는 지난 기록으로 보여줌
+@login_required
+def dashboard_page(request):
+    entries = []
+    history = []
+    for participant in user_participations(request.user.pk, with_challenge=True):
+        if participant.challenge is None:
+            continue
+        status = progress(participant)
+        entry = {'participant': participant, 'challenge': participant.challenge, **status}
+        (entries if status['active'] else history).append(entry)
+    return render(request, 'habit_stacker/dashboard.html', {'entries': entries, 'history': history})
+
+# 미리 집계해둔 테이블에서 한 페이지씩만 읽는 리더보드
+def leaderboard_page(request):
+    category = request.GET.get('category') or None
+    return render(
+        request,
+        'habit_stacker/leaderboard.html',
+        {
+            'category': category,
+            'categories': Challenge.CATEGORY_CHOICES,
+            'trending': leaderboards.trending_challenges(category),
+            'completion': leaderboards.completion_leaders(category),
+            'users': leaderboards.top_users(category or ''),
+        }
+    )
+
 def main_page(request):
+    # 익명 메인 페이지는 캐시에 있으면 DB를 전혀 거치지 않음
+    if fragments.is_cacheable(request):
+        key = fragments.list_page_key(request)
+        response = fragments.cached_response(key)
+        if response is not None:
+            return response
+        response = ChallengeList.as_view()(request)
+        response.add_post_render_callback(lambda r: fragments.store_response(request, key, r))
+        return response
+
     challenge_list = ChallengeList.as_view()
     return challenge_list(request)
 
+# 목록 필터 (?status=active|ending_soon&category=...)
+def filter_challenges(queryset, params):
+    status = params.get('status')
+    if status == 'active':
+        queryset = queryset.active()
+    elif status == 'ending_soon':
+        queryset = queryset.ending_soon()
+    category = params.get('category')
+    if category:
+        queryset = queryset.filter(category=category)
+    return queryset
+
 # CBV로 페이지 만들기
-class ChallengeList(ListView):
+class ChallengeList(CursorPaginationMixin, ListView):
     model = Challenge
     template_name = 'habit_stacker/challenge_list.html'
     ordering = '-pk' # 최신 글부터 나열
     paginate_by = 12
+    extra_context = {'categories': Challenge.CATEGORY_CHOICES}
+    pagination_mode = 'cursor' # 'offset'으로 바꾸면 기존 ?page= 방식 (challenge_list.html 은 둘 다 지원)
+
+    def get_queryset(self):
+        return filter_challenges(super().get_queryset(), self.request.GET)
+
+
+# ASGI(daphne)용 async 뷰
+# 템플릿의 auth 컨텍스트 프로세서가 동기 DB 조회를 하지 않도록 사용자를 미리 비동기로 불러둠
+async def _aload_user(request):
+    user = await request.auser()
+    request.user = user
+    return user
+
+
+async def amain_page(request):
+    cacheable = fragments.is_cacheable(request)
+    if cacheable:
+        key = fragments.list_page_key(request)
+        response = fragments.cached_response(key)
+        if response is not None:
+            return response
+
+    await _aload_user(request)
+    paginator = CursorPaginator(filter_challenges(Challenge.objects.all(), request.GET), ChallengeList.paginate_by)
+    try:
+        page = await paginator.apage(request.GET.get(ChallengeList.cursor_kwarg))
+    except InvalidCursor as e:
+        raise Http404(str(e))
+
+    response = render(
+        request,
+        ChallengeList.template_name,
+        {
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+            'object_list': page.object_list,
+            'challenge_list': page.object_list,
+            'cursor_query': cursor_query_prefix(request.GET, ChallengeList.cursor_kwarg),
+            **ChallengeList.extra_context,
+        }
+    )
+    if cacheable:
+        fragments.store_response(request, key, response)
+    return response
+
+
+async def asingle_challenge_page(request, pk):
+    cacheable = fragments.is_cacheable(request)
+    if cacheable:
+        key = fragments.challenge_page_key(pk)
+        response = fragments.cached_response(key)
+        if response is not None:
+            return response
+
+    user = await _aload_user(request)
+    if user.is_authenticated and await ahas_joined(user, pk):
+        return redirect('joined_challenge', pk=pk)
+
+    challenge = await Challenge.objects.aget(pk=pk)
+    recommendations = challenge.recommendations.select_related('recommended').order_by('rank')
+
+    response = render(
+        request,
+        'habit_stacker/single_challenge_page.html',
+        {
+            'challenge': challenge,
+            'recommendations': [item async for item in recommendations],
+        }
+    )
+    if cacheable:
+        fragments.store_response(request, key, response)
+    return response
+
+
+# 챌린지 검색 (?q=검색어&category=&duration=)
+def search_page(request):
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'query': query, 'results': [], 'facets': {}})
+
+    category = request.GET.get('category') or None
+    duration = request.GET.get('duration') or None
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 20)), 50))
+    except ValueError:
+        limit = 20
+
+    backend = get_search_backend()
+    results = backend.search(query, category=category, duration=duration, limit=limit)
+    return JsonResponse({
+        'query': query,
+        'results': [
+            {
+                'id': challenge.pk,
+                'title': challenge.title,
+                'category': challenge.category,
+                'duration': challenge.duration,
+                'url': challenge.get_absolute_url(),
+                'rank': rank,
+            }
+            for challenge, rank in results
+        ],
+        'facets': backend.facets(query),
+    })
 
 
 # CBV로 챌린지 생성하기
@@ -78,9 +267,16 @@ class ChallengeCreate(LoginRequiredMixin, CreateView):
     success_url = reverse_lazy('challenge_list') # 'challenge_list'는 리디렉션될 페이지의 URL 이름
 
 ##회원 관리 코드
+# 요청 제한에 걸렸을 때: 비밀번호 확인 없이 바로 429 로 돌려보냄
+def _too_many_requests(request, template, form):
+    messages.error(request, '요청이 너무 많습니다. 잠시 후 다시 시도해주세요.')
+    return render(request, template, {'form': form}, status=429)
+
 @csrf_protect
 def signup(request):
     if request.method == 'POST':
+        if not ratelimit.allow(request, 'signup'):
+            return _too_many_requests(request, 'habit_stacker/signup.html', SignUpForm())
         form = SignUpForm(request.POST)
         if form.is_valid():
             try:
@@ -97,6 +293,8 @@ def signup(request):
 @csrf_protect
 def login_view(request):
     if request.method == 'POST':
+        if not ratelimit.allow(request, 'login'):
+            return _too_many_requests(request, 'habit_stacker/login.html', LoginForm())
         form = LoginForm(request.POST)
         if form.is_valid():
             email = form.cleaned_data.get('email')
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "habit_stacker.settings")
 
 application = get_wsgi_application()
+
+# 빌드된 정적 파일은 시작할 때 만든 색인으로 바로 보냄
+if getattr(settings, "HABIT_STATIC_SERVE", False):
+    from .staticassets import StaticFilesWSGI
+
+    application = StaticFilesWSGI(application)